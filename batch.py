@@ -0,0 +1,350 @@
+# batch.py
+
+import argparse
+import glob
+import os
+import sys
+import time
+from collections import Counter, deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+import instrumentation
+from parser import parse_resume
+from ppt_merger import DEFAULT_OVERFLOW, OVERFLOW_MODES, merge_into_template, merge_many_into_template
+from resume_cache import ResumeCache
+from skill_matcher import load_skill_matcher
+
+DEFAULT_TEMPLATE = "Final Template.pptx"
+OUTPUT_DIR       = "output"
+RESUME_EXTS      = (".docx", ".pdf")
+
+
+def output_path_for(filepath: str, output_dir: str = OUTPUT_DIR, taken: set[str] | None = None) -> str:
+    """
+    Build the output path for a résumé the same way the GUI does:
+    `<output_dir>/formatted_<name>.pptx`. If that path is already in `taken` (a set of
+    lowercased paths), the source extension and then a counter are appended:
+    `formatted_<name>_<ext>.pptx`, `formatted_<name>_<ext>_2.pptx`, ...
+    """
+    name_no_ext, ext = os.path.splitext(os.path.basename(filepath))
+    base = f"formatted_{name_no_ext}"
+    path = os.path.join(output_dir, base + ".pptx")
+    if not taken:
+        return path
+    if path.lower() in taken:
+        base += "_" + ext.lstrip(".").lower()
+        path = os.path.join(output_dir, base + ".pptx")
+    n = 2
+    while path.lower() in taken:
+        path = os.path.join(output_dir, f"{base}_{n}.pptx")
+        n += 1
+    return path
+
+
+def output_paths_for(inputs: list[str], output_dir: str = OUTPUT_DIR,
+                     taken: set[str] | None = None) -> dict[str, str]:
+    """
+    Give every input its own output path. Inputs whose name is unique keep the plain
+    `formatted_<name>.pptx`; the others (e.g. `x/cv.docx`, `y/cv.docx`, `x/cv.pdf`)
+    are disambiguated in input order as described in `output_path_for`. Paths in
+    `taken` (lowercased, e.g. outputs of jobs still running) are never handed out.
+    """
+    taken = set(taken or ())
+    natural = {path: output_path_for(path, output_dir).lower() for path in inputs}
+    counts = Counter(natural.values())
+    unique = {p for p in natural.values() if counts[p] == 1 and p not in taken}
+    taken |= unique
+    paths = {}
+    for path in inputs:
+        if natural[path] in unique:
+            paths[path] = output_path_for(path, output_dir)
+        else:
+            paths[path] = output_path_for(path, output_dir, taken)
+            taken.add(paths[path].lower())
+    return paths
+
+
+def collect_inputs(patterns: list[str]) -> list[str]:
+    """
+    Expand directories and glob patterns into a sorted, de-duplicated list of
+    .docx/.pdf files. Directories are searched recursively.
+    """
+    found = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            for dirpath, _, filenames in os.walk(pattern):
+                for fn in filenames:
+                    if fn.lower().endswith(RESUME_EXTS):
+                        found.add(os.path.join(dirpath, fn))
+        else:
+            for path in glob.glob(pattern, recursive=True):
+                if os.path.isfile(path) and path.lower().endswith(RESUME_EXTS):
+                    found.add(path)
+    return sorted(found)
+
+
+_CACHES: dict[str, ResumeCache] = {}
+
+
+def _get_cache(cache_dir: str) -> ResumeCache:
+    """One ResumeCache per directory per process, so worker processes reuse theirs."""
+    cache = _CACHES.get(cache_dir)
+    if cache is None:
+        cache = _CACHES[cache_dir] = ResumeCache(cache_dir)
+    return cache
+
+
+def _init_worker(metrics_path: str | None):
+    if metrics_path:
+        instrumentation.add_sink(instrumentation.jsonl_sink(metrics_path))
+
+
+def _new_pool(workers: int, metrics_path: str | None) -> ProcessPoolExecutor:
+    return ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                               initargs=(metrics_path,))
+
+
+def _run_tasks(fn, tasks: list[tuple], workers: int | None, metrics_path: str | None):
+    """
+    Yield (task, result) for `fn(*task)` over `tasks`, in completion order, using a
+    process pool with at most one task in flight per worker.
+
+    If a worker process dies (out of memory, a crash in a native library) the pool
+    breaks and every task in flight fails with it. Those tasks are then rerun one at
+    a time, each in a fresh process, and the rest continue in a new pool. A task that
+    kills its worker even when run alone yields (task, <BrokenProcessPool>).
+    """
+    workers = workers or os.cpu_count() or 1
+    queue = deque(tasks)
+    suspects = []
+    while queue or suspects:
+        for task in suspects:
+            with _new_pool(1, metrics_path) as pool:
+                try:
+                    yield task, pool.submit(fn, *task).result()
+                except BrokenProcessPool as e:
+                    yield task, e
+        suspects = []
+
+        with _new_pool(workers, metrics_path) as pool:
+            in_flight = {}
+            broken = False
+            while (queue or in_flight) and not broken:
+                try:
+                    while queue and len(in_flight) < workers:
+                        future = pool.submit(fn, *queue[0])
+                        in_flight[future] = queue.popleft()
+                except BrokenProcessPool:
+                    broken = True
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    task = in_flight.pop(future)
+                    try:
+                        yield task, future.result()
+                    except BrokenProcessPool:
+                        suspects.append(task)
+                        broken = True
+            suspects.extend(in_flight.values())
+
+
+def _parse(filepath: str, cache: ResumeCache | None, skills_path: str | None) -> dict:
+    skill_matcher = load_skill_matcher(skills_path) if skills_path else None
+    if cache:
+        return cache.parse(filepath, skill_matcher)
+    return parse_resume(filepath, skill_matcher=skill_matcher)
+
+
+def format_one(filepath: str, template_path: str, output_dir: str = OUTPUT_DIR,
+               cache_dir: str | None = None, skills_path: str | None = None,
+               output_path: str | None = None, overflow: str = DEFAULT_OVERFLOW) -> dict:
+    """
+    Parse one résumé and merge it into the template, going through the on-disk
+    ResumeCache in `cache_dir` if one is given. `skills_path` is an optional skill
+    taxonomy (see skill_matcher.SkillMatcher.from_file). The deck is written to
+    `output_path`, or to `output_path_for(filepath, output_dir)` if not given.
+    `overflow` is one of ppt_merger.OVERFLOW_MODES.
+
+    Never raises: failures are reported in the returned dict so that a single bad
+    file cannot abort a batch. Keys: source, output, error, seconds, cache (hit/miss
+    counts for this file).
+    """
+    started = time.perf_counter()
+    result = {"source": filepath, "output": "", "error": "", "seconds": 0.0, "cache": {}}
+    cache = _get_cache(cache_dir) if cache_dir else None
+    before = dict(cache.stats) if cache else {}
+    try:
+        output_path = output_path or output_path_for(filepath, output_dir)
+        parsed = _parse(filepath, cache, skills_path)
+        if cache:
+            cache.render(parsed, template_path, output_path, overflow)
+        else:
+            merge_into_template(parsed, template_path, output_path, overflow)
+        result["output"] = output_path
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+    if cache:
+        result["cache"] = {k: v - before[k] for k, v in cache.stats.items()}
+    result["seconds"] = time.perf_counter() - started
+    return result
+
+
+def parse_one(filepath: str, cache_dir: str | None = None, skills_path: str | None = None) -> dict:
+    """
+    Parse one résumé (through the cache if given). Never raises; keys: source,
+    parsed (None on failure), error, seconds, cache (hit/miss counts for this file).
+    """
+    started = time.perf_counter()
+    result = {"source": filepath, "parsed": None, "error": "", "seconds": 0.0, "cache": {}}
+    cache = _get_cache(cache_dir) if cache_dir else None
+    before = dict(cache.stats) if cache else {}
+    try:
+        result["parsed"] = _parse(filepath, cache, skills_path)
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+    if cache:
+        result["cache"] = {k: v - before[k] for k, v in cache.stats.items()}
+    result["seconds"] = time.perf_counter() - started
+    return result
+
+
+def run_deck(inputs: list[str], template_path: str, deck_path: str, workers: int | None = None,
+             on_result=None, cache_dir: str | None = None, metrics_path: str | None = None,
+             skills_path: str | None = None, overflow: str = DEFAULT_OVERFLOW) -> list[dict]:
+    """
+    Parse every file in `inputs` in parallel, then render all successfully parsed
+    résumés into one deck at `deck_path`, one slide each, in input order.
+    Returns the parse results (with "output" set to `deck_path` for included files).
+    """
+    if not inputs:
+        return []
+
+    by_source = {}
+    tasks = [(path, cache_dir, skills_path) for path in inputs]
+    for task, result in _run_tasks(parse_one, tasks, workers, metrics_path):
+        if isinstance(result, BrokenProcessPool):
+            result = _crashed_result(task[0], result, parsed=None, cache={})
+        by_source[task[0]] = result
+    results = [by_source[path] for path in inputs]
+
+    parsed_list = [r["parsed"] for r in results if not r["error"]]
+    if parsed_list:
+        os.makedirs(os.path.dirname(deck_path) or ".", exist_ok=True)
+        sink = instrumentation.jsonl_sink(metrics_path) if metrics_path else None
+        if sink:
+            instrumentation.add_sink(sink)
+        try:
+            merge_many_into_template(parsed_list, template_path, deck_path, overflow)
+        except Exception as e:
+            for r in results:
+                if not r["error"]:
+                    r["error"] = f"{type(e).__name__}: {e}"
+        finally:
+            if sink:
+                instrumentation.remove_sink(sink)
+    for r in results:
+        r["output"] = "" if r["error"] else deck_path
+        if on_result:
+            on_result(r)
+    return results
+
+
+def run_batch(inputs: list[str], template_path: str, output_dir: str = OUTPUT_DIR,
+              workers: int | None = None, on_result=None, cache_dir: str | None = None,
+              metrics_path: str | None = None, skills_path: str | None = None,
+              overflow: str = DEFAULT_OVERFLOW) -> list[dict]:
+    """
+    Format every file in `inputs` using a pool of `workers` processes
+    (default: one per CPU). `on_result(result)` is called in the parent process
+    as each file finishes. Returns the list of result dicts in completion order.
+    Every input gets its own output (see `output_paths_for`), and a file that
+    crashes its worker process is reported as failed without stopping the batch.
+    If `metrics_path` is set, every worker appends per-stage trace events to it.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    results = []
+    if not inputs:
+        return results
+
+    outputs = output_paths_for(inputs, output_dir)
+    tasks = [(path, template_path, output_dir, cache_dir, skills_path, outputs[path], overflow)
+             for path in inputs]
+    for task, result in _run_tasks(format_one, tasks, workers, metrics_path):
+        if isinstance(result, BrokenProcessPool):
+            result = _crashed_result(task[0], result, output="", cache={})
+        results.append(result)
+        if on_result:
+            on_result(result)
+
+    # Workers only see their own writes; enforce the size bound across all of them
+    if cache_dir:
+        _get_cache(cache_dir).prune()
+    return results
+
+
+def _crashed_result(filepath: str, error: BrokenProcessPool, **fields) -> dict:
+    """Result dict for a file whose worker process died while handling it."""
+    return {"source": filepath, **fields, "error": f"{type(error).__name__}: {error}", "seconds": 0.0}
+
+
+def _print_result(result: dict):
+    if result["error"]:
+        print(f"FAIL {result['source']}: {result['error']}", file=sys.stderr)
+    else:
+        print(f"ok   {result['source']} -> {result['output']} ({result['seconds']:.2f}s)")
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description="Format a batch of résumés into the PPT template.")
+    ap.add_argument("inputs", nargs="+", help="résumé files, directories or glob patterns")
+    ap.add_argument("-t", "--template", default=DEFAULT_TEMPLATE, help="PPTX template path")
+    ap.add_argument("-o", "--output-dir", default=OUTPUT_DIR, help="directory for formatted decks")
+    ap.add_argument("-j", "--workers", type=int, default=None,
+                    help="number of worker processes (default: CPU count)")
+    ap.add_argument("--deck", default=None,
+                    help="render all résumés into this single PPTX instead of one file each")
+    ap.add_argument("--cache-dir", default=None,
+                    help="reuse parsed résumés and rendered decks from this cache directory")
+    ap.add_argument("--skills", default=None,
+                    help="JSON skill taxonomy; skills mentioned anywhere are added to the Skills list")
+    ap.add_argument("--overflow", choices=OVERFLOW_MODES, default=DEFAULT_OVERFLOW,
+                    help="text too long for its box: shrink the font, continue on extra slides, "
+                         "or leave it as is (default: %(default)s)")
+    ap.add_argument("--metrics", default=None,
+                    help="append per-stage timing events as JSON lines to this file")
+    ap.add_argument("-q", "--quiet", action="store_true", help="only report failures")
+    args = ap.parse_args(argv)
+
+    inputs = collect_inputs(args.inputs)
+    if not inputs:
+        print("No .docx or .pdf files found.", file=sys.stderr)
+        return 2
+
+    def report(result):
+        if result["error"] or not args.quiet:
+            _print_result(result)
+
+    started = time.perf_counter()
+    if args.deck:
+        results = run_deck(inputs, args.template, args.deck, args.workers, on_result=report,
+                           cache_dir=args.cache_dir, metrics_path=args.metrics,
+                           skills_path=args.skills, overflow=args.overflow)
+    else:
+        results = run_batch(inputs, args.template, args.output_dir, args.workers, on_result=report,
+                            cache_dir=args.cache_dir, metrics_path=args.metrics,
+                            skills_path=args.skills, overflow=args.overflow)
+    elapsed = time.perf_counter() - started
+
+    failed = sum(1 for r in results if r["error"])
+    print(f"{len(results) - failed}/{len(results)} formatted in {elapsed:.1f}s, {failed} failed")
+    if args.cache_dir:
+        totals = {}
+        for r in results:
+            for k, v in r.get("cache", {}).items():
+                totals[k] = totals.get(k, 0) + v
+        print("cache: " + ", ".join(f"{k}={v}" for k, v in sorted(totals.items())))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
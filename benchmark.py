@@ -0,0 +1,231 @@
+# benchmark.py
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+from parser import _extract_from_docx, _extract_from_pdf, parse_resume
+from ppt_merger import CompiledTemplate, merge_into_template
+
+DEFAULT_TEMPLATE = "Final Template.pptx"
+
+# Synthetic corpus: case name -> number of experience entries.
+# Each entry has a header line plus BULLETS_PER_ENTRY description lines.
+CORPUS = {
+    "tiny":   3,
+    "small":  10,
+    "medium": 40,
+    "large":  150,
+    "huge":   480,
+}
+BULLETS_PER_ENTRY = 4
+PDF_LINES_PER_PAGE = 50
+
+
+def _synthetic_lines(entries: int) -> list[str]:
+    """Build the text lines of a résumé with `entries` experience entries."""
+    lines = [
+        "Alex Example – Senior Software Engineer",
+        "alex.example@example.com",
+        "+1 555 010 0199",
+        "221 Baker Street, London, United Kingdom",
+        "Summary",
+        "Engineer with a long track record of building reliable distributed systems.",
+        "Skills",
+        "Python, Go, SQL, Kubernetes, Terraform, AWS, GCP, Kafka, Spark",
+        "Education",
+        "MSc Computer Science, University of Somewhere (2008–2010)",
+        "BSc Mathematics, University of Elsewhere (2005–2008)",
+        "Experience",
+    ]
+    for i in range(entries):
+        year = 2024 - i % 30
+        lines.append(f"Engineer {i}, Company {i} Ltd ({year - 2}–{year})")
+        for b in range(BULLETS_PER_ENTRY):
+            lines.append(f"Delivered project {i}.{b} improving throughput by {10 + b}% across {3 + i % 7} teams")
+    return lines
+
+
+def write_docx(lines: list[str], path: str):
+    from docx import Document
+
+    doc = Document()
+    for line in lines:
+        doc.add_paragraph(line)
+    doc.save(path)
+
+
+def _pdf_escape(text: str) -> bytes:
+    text = text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+    return text.encode("cp1252", "replace")
+
+
+def write_pdf(lines: list[str], path: str):
+    """
+    Write a minimal text-only PDF (Helvetica, PDF_LINES_PER_PAGE lines per page).
+    Hand-rolled so the benchmark needs no PDF writer beyond the standard library.
+    """
+    pages = [lines[i:i + PDF_LINES_PER_PAGE] for i in range(0, len(lines), PDF_LINES_PER_PAGE)] or [[]]
+    objects = [b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>"]
+    pages_obj = 2 + 2 * len(pages)  # font, then (content, page) per page, then Pages
+    page_ids = []
+    for page_lines in pages:
+        ops = [b"BT /F1 10 Tf 14 TL 40 800 Td"]
+        ops += [b"(" + _pdf_escape(line) + b") Tj T*" for line in page_lines]
+        ops.append(b"ET")
+        stream = b"\n".join(ops)
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        objects.append(b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 595 842] /Contents %d 0 R "
+                       b"/Resources << /Font << /F1 1 0 R >> >> >>" % (pages_obj, len(objects)))
+        page_ids.append(len(objects))
+    kids = b" ".join(b"%d 0 R" % i for i in page_ids)
+    objects.append(b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(page_ids)))
+    objects.append(b"<< /Type /Catalog /Pages %d 0 R >>" % pages_obj)
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % off for off in offsets)
+    out += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1, len(objects), xref)
+    with open(path, "wb") as fh:
+        fh.write(out)
+
+
+def build_corpus(directory: str, cases: list[str]) -> dict[str, dict[str, str]]:
+    """Write one .docx and one .pdf per case. Returns case -> {"docx": path, "pdf": path}."""
+    os.makedirs(directory, exist_ok=True)
+    corpus = {}
+    for case in cases:
+        lines = _synthetic_lines(CORPUS[case])
+        paths = {"docx": os.path.join(directory, f"{case}.docx"),
+                 "pdf":  os.path.join(directory, f"{case}.pdf")}
+        write_docx(lines, paths["docx"])
+        write_pdf(lines, paths["pdf"])
+        corpus[case] = paths
+    return corpus
+
+
+def _measure(fn, repeat: int) -> dict:
+    """Time `fn` `repeat` times, then run it once more under tracemalloc for peak memory."""
+    fn()  # warm-up (imports, template load)
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    median = statistics.median(timings)
+    return {
+        "median_s":     median,
+        "min_s":        min(timings),
+        "throughput_s": 1.0 / median if median else float("inf"),
+        "peak_kib":     peak / 1024,
+    }
+
+
+def _stages(paths: dict[str, str], template: CompiledTemplate, template_path: str, scratch: str,
+            pdf_workers: int = 1):
+    """Yield (stage name, input path, callable) for every measured stage of one case."""
+    parsed = parse_resume(paths["docx"])
+    output_path = os.path.join(scratch, "out.pptx")
+
+    yield "extract_docx", paths["docx"], lambda: _extract_from_docx(paths["docx"])
+    yield "extract_pdf", paths["pdf"], lambda: _extract_from_pdf(paths["pdf"])
+    if pdf_workers > 1:
+        yield "extract_pdf_parallel", paths["pdf"], lambda: _extract_from_pdf(paths["pdf"], pdf_workers)
+    yield "parse_docx", paths["docx"], lambda: parse_resume(paths["docx"])
+    yield "parse_pdf", paths["pdf"], lambda: parse_resume(paths["pdf"])
+    yield "merge_build", None, lambda: template.build(parsed)
+    template.build(parsed)
+    yield "save", None, lambda: template.save(output_path)
+    yield "merge_into_template", None, lambda: merge_into_template(parsed, template_path, output_path)
+
+
+def run(cases: list[str], template_path: str, repeat: int, corpus_dir: str | None = None,
+        pdf_workers: int = 1) -> dict:
+    with tempfile.TemporaryDirectory() as scratch:
+        corpus = build_corpus(corpus_dir or os.path.join(scratch, "corpus"), cases)
+        template = CompiledTemplate(template_path)
+        results = []
+        for case in cases:
+            for stage, input_path, fn in _stages(corpus[case], template, template_path, scratch,
+                                                     pdf_workers):
+                row = {"case": case, "stage": stage, "entries": CORPUS[case]}
+                if input_path:
+                    row["input_bytes"] = os.path.getsize(input_path)
+                row.update(_measure(fn, repeat))
+                results.append(row)
+                print(f"{case:>7} {stage:<20} {row['median_s'] * 1000:9.2f} ms "
+                      f"{row['throughput_s']:9.1f}/s {row['peak_kib']:10.0f} KiB", file=sys.stderr)
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python":    platform.python_version(),
+            "platform":  platform.platform(),
+            "repeat":    repeat,
+            "template":  template_path,
+            "pdf_workers": pdf_workers,
+        },
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list[str]:
+    """Return a message for every (case, stage) whose median slowed by more than `threshold`x."""
+    old = {(r["case"], r["stage"]): r for r in baseline["results"]}
+    regressions = []
+    for row in current["results"]:
+        before = old.get((row["case"], row["stage"]))
+        if before and before["median_s"] and row["median_s"] / before["median_s"] > threshold:
+            regressions.append(f"{row['case']}/{row['stage']}: {before['median_s'] * 1000:.2f} ms -> "
+                               f"{row['median_s'] * 1000:.2f} ms ({row['median_s'] / before['median_s']:.2f}x)")
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description="Benchmark the résumé extract/parse/merge/save stages.")
+    ap.add_argument("--cases", nargs="+", choices=list(CORPUS), default=list(CORPUS))
+    ap.add_argument("-t", "--template", default=DEFAULT_TEMPLATE, help="PPTX template path")
+    ap.add_argument("-n", "--repeat", type=int, default=5, help="timed runs per stage")
+    ap.add_argument("-o", "--output", help="write results as JSON to this file")
+    ap.add_argument("--pdf-workers", type=int, default=1,
+                    help="also time PDF extraction with this many worker processes")
+    ap.add_argument("--corpus-dir", help="keep the generated résumés in this directory")
+    ap.add_argument("--baseline", help="JSON results of an earlier run to compare against")
+    ap.add_argument("--threshold", type=float, default=1.25,
+                    help="slowdown factor that counts as a regression (default: 1.25)")
+    args = ap.parse_args(argv)
+
+    report = run(args.cases, args.template, args.repeat, args.corpus_dir, args.pdf_workers)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as fh:
+            regressions = compare(report, json.load(fh), args.threshold)
+        for message in regressions:
+            print(f"REGRESSION {message}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,54 +1,149 @@
 # gui.py
 
 import os
+import queue
 import tkinter as tk
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from tkinter import filedialog, messagebox
 
-from parser import parse_resume
-from ppt_merger import merge_into_template
+from batch import format_one, output_paths_for
 
 # Path to the PPT template
 TEMPLATE_PATH = os.path.join("templates", "Resume.pptx")
 OUTPUT_DIR    = "output"
 
-def on_select_and_format():
+class FormatJobs:
     """
-    1) Let user pick a résumé file (.docx or .pdf)
-    2) parse_resume(filepath)
-    3) merge_into_template(parsed, TEMPLATE_PATH, output_path)
-    4) show success or error
+    Runs résumé formatting in a background process pool and reports back to the
+    Tk mainloop through a thread-safe queue, so the window never blocks on parsing
+    or saving. Pool callbacks only touch the queue; all widget updates happen in
+    `_poll`, which runs on the UI thread via `root.after`.
+
+    Every job gets its own output path, also among jobs still running from earlier
+    submits. If a worker process dies, its jobs are reported as failed and the pool
+    is replaced.
     """
-    # 1) File dialog
-    filepath = filedialog.askopenfilename(
-        title="Select résumé to format",
-        filetypes=[("Word Documents", "*.docx"), ("PDF Files", "*.pdf"), ("All Files", "*.*")]
+
+    POLL_MS = 100
+
+    def __init__(self, root, status_var, results_list, cancel_button):
+        self.root = root
+        self.status_var = status_var
+        self.results_list = results_list
+        self.cancel_button = cancel_button
+        self.events = queue.Queue()
+        self.pool = None
+        self.futures = []
+        self.outputs = {}  # running future -> its lowercased output path
+        self.pool_of = {}  # running future -> the pool running it
+        self.total = self.done = self.failed = 0
+
+    def submit(self, filepaths):
+        os.makedirs(OUTPUT_DIR, exist_ok=True)
+        outputs = output_paths_for(filepaths, OUTPUT_DIR, taken=set(self.outputs.values()))
+        for path in filepaths:
+            future = self._submit(path, outputs[path])
+            future.add_done_callback(lambda f, path=path: self.events.put((path, f)))
+            self.futures.append(future)
+            self.outputs[future] = outputs[path].lower()
+        self.total += len(filepaths)
+        self.cancel_button.config(state=tk.NORMAL)
+        self._update_status()
+        if len(self.futures) == len(filepaths):
+            self.root.after(self.POLL_MS, self._poll)
+
+    def _submit(self, path, output_path):
+        """Submit one job, replacing the pool first if it has lost a worker."""
+        for attempt in range(2):
+            if self.pool is None:
+                self.pool = ProcessPoolExecutor()
+            pool = self.pool
+            try:
+                future = pool.submit(format_one, path, TEMPLATE_PATH, OUTPUT_DIR, output_path=output_path)
+            except BrokenProcessPool:
+                if attempt:
+                    raise
+                self._replace_pool(pool)
+                continue
+            self.pool_of[future] = pool
+            return future
+
+    def _replace_pool(self, pool):
+        """Drop `pool` if it is still the current one; the next submit starts a new pool."""
+        if pool is self.pool:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+            self.pool = None
+
+    def cancel(self):
+        """Cancel every job that has not started yet; running jobs finish normally."""
+        for future in self.futures:
+            future.cancel()
+
+    def shutdown(self):
+        if self.pool is not None:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+
+    def _poll(self):
+        while True:
+            try:
+                path, future = self.events.get_nowait()
+            except queue.Empty:
+                break
+            self.futures.remove(future)
+            self.outputs.pop(future)
+            pool = self.pool_of.pop(future)
+            self.done += 1
+            name = os.path.basename(path)
+            if future.cancelled():
+                self.failed += 1
+                self.results_list.insert(tk.END, f"Cancelled  {name}")
+            else:
+                try:
+                    result = future.result()
+                except BrokenProcessPool as e:
+                    # The worker died (out of memory, a crash in a native library)
+                    self._replace_pool(pool)
+                    result = {"error": f"{type(e).__name__}: {e}"}
+                if result["error"]:
+                    self.failed += 1
+                    self.results_list.insert(tk.END, f"Failed     {name}: {result['error']}")
+                else:
+                    self.results_list.insert(tk.END, f"Saved      {result['output']}")
+            self.results_list.see(tk.END)
+        self._update_status()
+
+        if self.futures:
+            self.root.after(self.POLL_MS, self._poll)
+        else:
+            self.cancel_button.config(state=tk.DISABLED)
+
+    def _update_status(self):
+        if self.done < self.total:
+            self.status_var.set(f"Formatting… {self.done}/{self.total} done")
+        else:
+            self.status_var.set(f"Finished: {self.done - self.failed} formatted, {self.failed} failed "
+                                f"(saved to {OUTPUT_DIR})")
+
+
+def on_select_and_format(jobs: FormatJobs):
+    """
+    1) Let user pick one or more résumé files (.docx or .pdf)
+    2) queue them on the background pool: parse_resume + merge_into_template
+    3) progress and per-file results are shown as jobs finish
+    """
+    filepaths = filedialog.askopenfilenames(
+        title="Select résumés to format",
+        filetypes=[("Résumés", "*.docx *.pdf"), ("Word Documents", "*.docx"),
+                   ("PDF Files", "*.pdf"), ("All Files", "*.*")]
     )
-    if not filepath:
+    if not filepaths:
         return  # user cancelled
 
-    # 2) Parse résumé
-    try:
-        parsed = parse_resume(filepath)
-    except Exception as e:
-        messagebox.showerror("Parsing Error", f"Failed to parse résumé:\n{e}")
-        return
-
-    # 3) Build output filename
-    base = os.path.basename(filepath)
-    name_no_ext, _ = os.path.splitext(base)
-    output_name = f"formatted_{name_no_ext}.pptx"
-    os.makedirs(OUTPUT_DIR, exist_ok=True)
-    output_path = os.path.join(OUTPUT_DIR, output_name)
-
-    # 4) Merge into template
     try:
-        merge_into_template(parsed, TEMPLATE_PATH, output_path)
+        jobs.submit(list(filepaths))
     except Exception as e:
-        messagebox.showerror("Merge Error", f"Failed to generate formatted PPT:\n{e}")
-        return
-
-    # 5) Success
-    messagebox.showinfo("Success", f"Formatted PPT saved to:\n{output_path}")
+        messagebox.showerror("Formatting Error", f"Failed to start formatting:\n{e}")
 
 def ask_for_details(parsed_data):
     """Opens a new window to ask for user's Name and Role."""
@@ -88,23 +183,41 @@ def ask_for_details(parsed_data):
 def build_gui():
     root = tk.Tk()
     root.title("Résumé → PPT Formatter")
-    root.geometry("400x160")
-    root.resizable(False, False)
+    root.geometry("520x360")
+    root.minsize(400, 240)
 
     tk.Label(
         root,
-        text="Upload your résumé to generate the formatted PPT:",
+        text="Upload your résumés to generate the formatted PPTs:",
         font=("Segoe UI", 11)
     ).pack(pady=15)
 
+    buttons = tk.Frame(root)
+    buttons.pack()
+
+    status_var = tk.StringVar(value="")
+    results_list = tk.Listbox(root, height=10)
+    cancel_button = tk.Button(buttons, text="Cancel", width=12, height=2, state=tk.DISABLED)
+    jobs = FormatJobs(root, status_var, results_list, cancel_button)
+    cancel_button.config(command=jobs.cancel)
+
     tk.Button(
-        root,
-        text="Select & Format Résumé",
-        command=on_select_and_format,
+        buttons,
+        text="Select & Format Résumés",
+        command=lambda: on_select_and_format(jobs),
         width=26,
         height=2
-    ).pack()
+    ).pack(side=tk.LEFT, padx=5)
+    cancel_button.pack(side=tk.LEFT, padx=5)
+
+    tk.Label(root, textvariable=status_var).pack(pady=5)
+    results_list.pack(fill=tk.BOTH, expand=True, padx=10, pady=(0, 10))
+
+    def on_close():
+        jobs.shutdown()
+        root.destroy()
 
+    root.protocol("WM_DELETE_WINDOW", on_close)
     root.mainloop()
 
 if __name__ == "__main__":
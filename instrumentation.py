@@ -0,0 +1,128 @@
+# instrumentation.py
+
+import json
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+# Registered event callbacks. While this is empty, trace() hands out a shared no-op
+# object, so instrumented code pays only a couple of attribute lookups.
+_SINKS = []
+
+
+def add_sink(callback):
+    """
+    Register `callback(event: dict)` to receive one event per instrumented call.
+    An event has keys: event, seconds, stages ({stage: seconds}), error (if raised),
+    plus whatever fields the call recorded (input_bytes, line_count, ...).
+    """
+    _SINKS.append(callback)
+
+
+def remove_sink(callback):
+    _SINKS.remove(callback)
+
+
+def log_sink(event: dict):
+    """Sink that writes each event as one JSON log record at INFO level."""
+    logger.info(json.dumps(event, ensure_ascii=False))
+
+
+def jsonl_sink(path: str):
+    """Return a sink that appends each event as one JSON line to `path`."""
+    def sink(event: dict):
+        with open(path, "a", encoding="utf-8") as fh:
+            fh.write(json.dumps(event, ensure_ascii=False) + "\n")
+    return sink
+
+
+class _Stage:
+    __slots__ = ("trace", "name", "started")
+
+    def __init__(self, trace, name):
+        self.trace = trace
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        stages = self.trace.stages
+        stages[self.name] = stages.get(self.name, 0.0) + time.perf_counter() - self.started
+        return False
+
+
+class Trace:
+    """
+    Collects per-stage timings and fields for one call and emits them to every sink
+    when the `with` block exits (also when it raises).
+    """
+
+    enabled = True
+
+    def __init__(self, name: str, **fields):
+        self.name = name
+        self.fields = fields
+        self.stages = {}
+
+    def stage(self, name: str) -> _Stage:
+        return _Stage(self, name)
+
+    def set(self, **fields):
+        self.fields.update(fields)
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        event = {"event": self.name, "seconds": time.perf_counter() - self.started,
+                 "stages": self.stages, **self.fields}
+        if exc_type is not None:
+            event["error"] = f"{exc_type.__name__}: {exc}"
+        for sink in list(_SINKS):
+            try:
+                sink(event)
+            except Exception:
+                logger.exception("metrics sink %r failed", sink)
+        return False
+
+
+class _NullTrace:
+    """Stand-in used while no sink is registered: every method is a no-op."""
+
+    enabled = False
+
+    def stage(self, name: str):
+        return self
+
+    def set(self, **fields):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_TRACE = _NullTrace()
+
+
+def trace(name: str, **fields):
+    """
+    Start tracing one call:
+
+        with trace("parse_resume", source=path) as t:
+            with t.stage("extract"):
+                ...
+            if t.enabled:
+                t.set(line_count=len(lines))
+
+    Guard expensive field computations with `t.enabled`.
+    """
+    if not _SINKS:
+        return _NULL_TRACE
+    return Trace(name, **fields)
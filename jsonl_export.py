@@ -0,0 +1,181 @@
+# jsonl_export.py
+
+import argparse
+import functools
+import itertools
+import json
+import os
+import sys
+import tempfile
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from batch import RESUME_EXTS
+from parser import parse_resume
+from skill_matcher import load_skill_matcher
+
+CHECKPOINT_EVERY = 100
+
+
+def iter_archive(path: str):
+    """
+    Lazily yield (entry_id, path, read) for every résumé in a directory tree or a
+    .zip archive, in a stable order so a run can be resumed. Directory entries carry
+    their path and read=None; zip members carry path=None and a `read()` callable
+    that loads just that member.
+    """
+    if os.path.isdir(path):
+        for dirpath, dirnames, filenames in os.walk(path):
+            dirnames.sort()
+            for fn in sorted(filenames):
+                if fn.lower().endswith(RESUME_EXTS):
+                    full = os.path.join(dirpath, fn)
+                    yield os.path.relpath(full, path), full, None
+    else:
+        with zipfile.ZipFile(path) as zf:
+            for info in zf.infolist():
+                if not info.is_dir() and info.filename.lower().endswith(RESUME_EXTS):
+                    yield info.filename, None, functools.partial(zf.read, info)
+
+
+def _parse_entry(entry_id: str, path: str | None, data: bytes | None,
+                 skills_path: str | None = None) -> dict:
+    """Parse one archive entry into its JSONL record. Never raises."""
+    record = {"source": entry_id}
+    tmp_path = None
+    try:
+        if path is None:
+            fd, tmp_path = tempfile.mkstemp(suffix=os.path.splitext(entry_id)[1].lower())
+            with os.fdopen(fd, "wb") as fh:
+                fh.write(data)
+            path = tmp_path
+        skill_matcher = load_skill_matcher(skills_path) if skills_path else None
+        record["parsed"] = parse_resume(path, skill_matcher=skill_matcher)
+    except Exception as e:
+        record["error"] = f"{type(e).__name__}: {e}"
+    finally:
+        if tmp_path:
+            os.remove(tmp_path)
+    return record
+
+
+def _read_checkpoint(path: str) -> dict | None:
+    try:
+        with open(path, encoding="utf-8") as fh:
+            return json.load(fh)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def _write_checkpoint(path: str, state: dict):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as fh:
+        json.dump(state, fh)
+        fh.flush()
+        os.fsync(fh.fileno())
+    os.replace(tmp_path, path)
+
+
+def export_jsonl(archive: str, output_path: str, workers: int | None = None, resume: bool = False,
+                 checkpoint_every: int = CHECKPOINT_EVERY, on_record=None,
+                 skills_path: str | None = None) -> int:
+    """
+    Parse every résumé in `archive` and write one JSON line per file to `output_path`,
+    in archive order, as soon as each file (and all files before it) is parsed.
+
+    At most a few jobs per worker are in flight, so memory does not grow with the
+    archive. Every `checkpoint_every` records the output is fsynced and
+    `<output_path>.checkpoint` records how many entries are done, the id of the last
+    one and the output size. With `resume=True` the output is truncated back to that
+    size and the completed entries are skipped without being read; if the archive no
+    longer has that last entry at the same position (files were added or removed
+    before it), ValueError is raised rather than skipping or repeating entries.
+    Returns the number of records written in this run.
+    """
+    checkpoint_path = output_path + ".checkpoint"
+    state = _read_checkpoint(checkpoint_path) if resume else None
+    if state and state.get("archive") != os.path.abspath(archive):
+        raise ValueError(f"{checkpoint_path} belongs to a different archive: {state.get('archive')}")
+    if not state:
+        state = {"archive": os.path.abspath(archive), "done": 0, "offset": 0, "last": None}
+
+    entries = iter_archive(archive)
+    if state["done"]:
+        skipped = deque(itertools.islice(entries, state["done"]), maxlen=1)
+        if not skipped or skipped[0][0] != state.get("last"):
+            raise ValueError(f"{archive} changed since {checkpoint_path} was written: entry "
+                             f"{state['done']} is no longer {state.get('last')!r}; "
+                             f"start over without resuming")
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = 4 * workers
+    written = 0
+    mode = "r+b" if os.path.exists(output_path) else "wb"
+    with open(output_path, mode) as out, ProcessPoolExecutor(max_workers=workers) as pool:
+        # Drop anything written after the last checkpoint (or everything, when not resuming)
+        out.truncate(state["offset"])
+        out.seek(state["offset"])
+        window = deque()
+
+        def drain_one():
+            nonlocal written
+            record = window.popleft().result()
+            out.write(json.dumps(record, ensure_ascii=False).encode("utf-8") + b"\n")
+            out.flush()
+            written += 1
+            state["done"] += 1
+            state["last"] = record["source"]
+            if on_record:
+                on_record(record)
+            if state["done"] % checkpoint_every == 0:
+                os.fsync(out.fileno())
+                state["offset"] = out.tell()
+                _write_checkpoint(checkpoint_path, state)
+
+        for entry_id, path, read in entries:
+            data = read() if read is not None else None
+            window.append(pool.submit(_parse_entry, entry_id, path, data, skills_path))
+            if len(window) >= max_in_flight:
+                drain_one()
+        while window:
+            drain_one()
+
+        out.flush()
+        os.fsync(out.fileno())
+        state["offset"] = out.tell()
+        _write_checkpoint(checkpoint_path, state)
+    return written
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description="Parse a résumé archive into JSON lines (no slides).")
+    ap.add_argument("archive", help="directory tree or .zip of .docx/.pdf résumés")
+    ap.add_argument("output", help="JSONL file to write")
+    ap.add_argument("-j", "--workers", type=int, default=None,
+                    help="number of worker processes (default: CPU count)")
+    ap.add_argument("--resume", action="store_true",
+                    help="continue from <output>.checkpoint instead of starting over")
+    ap.add_argument("--skills", default=None,
+                    help="JSON skill taxonomy; skills mentioned anywhere are added to the Skills list")
+    ap.add_argument("--checkpoint-every", type=int, default=CHECKPOINT_EVERY,
+                    help="records between checkpoints")
+    args = ap.parse_args(argv)
+
+    failed = 0
+
+    def report(record):
+        nonlocal failed
+        if "error" in record:
+            failed += 1
+            print(f"FAIL {record['source']}: {record['error']}", file=sys.stderr)
+
+    started = time.perf_counter()
+    written = export_jsonl(args.archive, args.output, args.workers, args.resume,
+                           args.checkpoint_every, on_record=report, skills_path=args.skills)
+    print(f"{written} records written in {time.perf_counter() - started:.1f}s, {failed} failed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,45 +1,256 @@
 # parser.py
 
+import itertools
 import os
 import re
+import zipfile
+from collections import deque
+from xml.etree import ElementTree
 
-from docx import Document
-from PyPDF2 import PdfReader
+import instrumentation
+
+# The PyPDF2 backend and the process pool are imported inside the extractors that need
+# them, so importing this module (GUI start-up, every batch worker) stays cheap.
+
+# Bump whenever parse_resume output changes so cached parses are invalidated.
+PARSER_VERSION = "6"
+
+
+_W_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_W_P, _W_R, _W_T = _W_NS + "p", _W_NS + "r", _W_NS + "t"
+_W_TAB, _W_BR, _W_CR = _W_NS + "tab", _W_NS + "br", _W_NS + "cr"
+_W_TBL, _W_SDT = _W_NS + "tbl", _W_NS + "sdt"
+
+
+def _iter_docx_lines(path: str):
+    """
+    Stream `word/document.xml` straight out of the .docx zip and yield stripped,
+    non-empty lines in document order: body paragraphs and the paragraphs inside
+    table cells alike. Only the document part is decompressed, so embedded images
+    and fonts are never loaded. Line breaks inside a paragraph split it into lines.
+    """
+    with zipfile.ZipFile(path) as zf, zf.open("word/document.xml") as xml:
+        for event, elem in ElementTree.iterparse(xml, events=("end",)):
+            tag = elem.tag
+            if tag == _W_P:
+                parts = []
+                for run in elem.iter(_W_R):
+                    for child in run:
+                        if child.tag == _W_T:
+                            parts.append(child.text or "")
+                        elif child.tag == _W_TAB:
+                            parts.append("\t")
+                        elif child.tag in (_W_BR, _W_CR):
+                            parts.append("\n")
+                # Clearing also drops nested paragraphs (text boxes) already yielded,
+                # so an enclosing paragraph never repeats their text.
+                elem.clear()
+                for line in "".join(parts).splitlines():
+                    line = line.strip()
+                    if line:
+                        yield line
+            elif tag in (_W_TBL, _W_SDT):
+                elem.clear()
 
 
 def _extract_from_docx(path: str) -> list[str]:
     """
-    Read all non-empty paragraphs from a .docx document and return as a list of lines.
+    Read all non-empty paragraphs (including table cells) from a .docx document and
+    return as a list of lines.
+    """
+    return list(_iter_docx_lines(path))
+
+
+# Optional extraction budget for PDFs: pass these as parse_resume(max_pages=...,
+# max_bytes=...) to stop reading long portfolios early. Off by default; a parse that
+# hits the budget is marked "truncated".
+PDF_MAX_PAGES = 20
+PDF_MAX_BYTES = 512 * 1024
+
+
+# Parallel PDF extraction: pages handed to a worker per task, and tasks kept queued
+# per worker (so an early stop does not leave the whole document being extracted).
+# Starting a pool and re-opening the PDF in each worker costs ~25 ms against ~3 ms per
+# page extracted, so shorter documents are read serially.
+PDF_PAGES_PER_TASK = 4
+PDF_TASKS_PER_WORKER = 2
+PDF_PARALLEL_MIN_PAGES = 24
+
+
+def _iter_pdf_page_texts(path: str, max_pages: int | None, truncated: list | None = None):
+    """
+    Yield the extracted text of each page in order, in this process. If pages are left
+    unread because of `max_pages`, "max_pages" is appended to `truncated`.
     """
-    doc = Document(path)
-    lines = [p.text.strip() for p in doc.paragraphs if p.text.strip()]
-    return lines
+    from PyPDF2 import PdfReader
+
+    with open(path, "rb") as fh:
+        reader = PdfReader(fh)
+        for page_no, page in enumerate(reader.pages):
+            if max_pages is not None and page_no >= max_pages:
+                if truncated is not None:
+                    truncated.append("max_pages")
+                return
+            yield page.extract_text()
+
 
+def _extract_pdf_page_range(path: str, start: int, stop: int) -> list[str]:
+    """Worker task: open the PDF independently and extract pages [start, stop)."""
+    from PyPDF2 import PdfReader
 
-def _extract_from_pdf(path: str) -> list[str]:
+    with open(path, "rb") as fh:
+        reader = PdfReader(fh)
+        return [reader.pages[i].extract_text() for i in range(start, stop)]
+
+
+def _iter_pdf_page_texts_parallel(path: str, max_pages: int | None, workers: int,
+                                  truncated: list | None = None):
+    """
+    Yield page texts in order while a process pool extracts them ahead of the reader.
+    Each task covers PDF_PAGES_PER_TASK pages; remaining tasks are cancelled when the
+    caller stops early. Documents under PDF_PARALLEL_MIN_PAGES pages are read serially.
+    """
+    from PyPDF2 import PdfReader
+
+    with open(path, "rb") as fh:
+        reader = PdfReader(fh)
+        page_count = len(reader.pages)
+        if max_pages is not None and page_count > max_pages:
+            page_count = max_pages
+            if truncated is not None:
+                truncated.append("max_pages")
+        if page_count < PDF_PARALLEL_MIN_PAGES:
+            for page_no in range(page_count):
+                yield reader.pages[page_no].extract_text()
+            return
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    ranges = iter([(start, min(start + PDF_PAGES_PER_TASK, page_count))
+                   for start in range(0, page_count, PDF_PAGES_PER_TASK)])
+    pool = ProcessPoolExecutor(max_workers=workers)
+    try:
+        pending = deque(pool.submit(_extract_pdf_page_range, path, start, stop)
+                        for start, stop in itertools.islice(ranges, workers * PDF_TASKS_PER_WORKER))
+        while pending:
+            texts = pending.popleft().result()
+            for start, stop in itertools.islice(ranges, 1):
+                pending.append(pool.submit(_extract_pdf_page_range, path, start, stop))
+            yield from texts
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _iter_pdf_lines(path: str, max_pages: int | None = None, max_bytes: int | None = None,
+                    workers: int = 1, truncated: list | None = None):
+    """
+    Yield stripped, non-empty lines from a PDF page by page, so the caller can stop
+    reading as soon as it has what it needs. Stops after `max_pages` pages or once
+    `max_bytes` bytes of text have been extracted (None disables a limit); the limit
+    that stopped reading ("max_pages" / "max_bytes") is appended to `truncated`.
+    With `workers` > 1, pages are extracted by a process pool and reassembled in order.
+    """
+    if workers > 1:
+        pages = _iter_pdf_page_texts_parallel(path, max_pages, workers, truncated)
+    else:
+        pages = _iter_pdf_page_texts(path, max_pages, truncated)
+
+    seen_bytes = 0
+    try:
+        for text in pages:
+            if not text:
+                continue
+            seen_bytes += len(text.encode("utf-8"))
+            for line in text.splitlines():
+                line = line.strip()
+                if line:
+                    yield line
+            if max_bytes is not None and seen_bytes >= max_bytes:
+                if truncated is not None:
+                    truncated.append("max_bytes")
+                return
+    finally:
+        pages.close()
+
+
+def _extract_from_pdf(path: str, workers: int = 1) -> list[str]:
     """
     Read all text from a PDF using PyPDF2, split into lines, and return non-empty lines.
     """
-    reader = PdfReader(path)
-    raw_text = []
-    for page in reader.pages:
-        text = page.extract_text()
-        if text:
-            raw_text.extend(text.splitlines())
-    # strip and filter empty
-    return [line.strip() for line in raw_text if line.strip()]
+    return list(_iter_pdf_lines(path, max_pages=None, max_bytes=None, workers=workers))
+
+
+# Section headings: canonical section key -> heading aliases. A line is a heading only
+# when the whole line equals an alias (case-insensitively, optionally followed by ":"),
+# so content such as "Profile-driven engineer." never opens a section. Add entries here
+# to support new sections.
+SECTION_HEADINGS = {
+    "skills":         ("skills", "technical skills", "core competencies"),
+    "summary":        ("summary", "professional summary", "profile", "objective"),
+    "education":      ("education", "academic background"),
+    "experience":     ("experience", "work experience", "professional experience", "employment history"),
+    "projects":       ("projects", "personal projects"),
+    "certifications": ("certifications", "certificates", "licenses"),
+}
+
+
+def _heading_text(line: str) -> str:
+    """Normalize a line for heading lookup: lowercase, single spaces, no trailing colon."""
+    return " ".join(line.lower().split()).rstrip(":").rstrip()
+
 
+def _compile_headings(headings: dict[str, tuple[str, ...]]) -> dict[str, str]:
+    """Compile a heading table into a normalized alias -> section key map."""
+    return {_heading_text(alias): key for key, aliases in headings.items() for alias in aliases}
 
-def _find_section(lines: list[str], heading: str) -> int:
+
+_DEFAULT_HEADINGS = _compile_headings(SECTION_HEADINGS)
+
+
+# Sections parse_resume reads. Passing this as `stop_after` stops streamed input at the
+# next heading once every section has been read; a repeated heading after that point is
+# dropped rather than merged, so callers opt in only when they accept that.
+ALL_SECTIONS = tuple(SECTION_HEADINGS)
+
+
+def _segment_sections(lines, headings: dict[str, tuple[str, ...]] | None = None,
+                      stop_after: tuple[str, ...] | None = None,
+                      truncated: list | None = None) -> dict[str, list[str]]:
     """
-    Return the index of the first line that starts with `heading` (case-insensitive),
-    or -1 if not found.
+    Split `lines` (any iterable) into sections in a single pass. Each line is normalized
+    and looked up in the heading table once; lines after a heading belong to that
+    section until the next heading. A repeated heading continues the existing section.
+
+    If `stop_after` is given, iteration stops at the first heading seen after every
+    section in `stop_after` has been read, so lazily produced lines beyond that point
+    are never pulled, and "stop_after" is appended to `truncated`.
+    Returns a dict with one (possibly empty) list per section key in the table.
     """
-    heading_lower = heading.lower()
-    for idx, line in enumerate(lines):
-        if line.lower().startswith(heading_lower):
-            return idx
-    return -1
+    table = SECTION_HEADINGS if headings is None else headings
+    alias_to_key = _DEFAULT_HEADINGS if headings is None else _compile_headings(headings)
+    sections = {key: [] for key in table}
+    pending = set(stop_after) if stop_after else None
+    current = None
+    for line in lines:
+        key = alias_to_key.get(_heading_text(line))
+        if key:
+            if pending is not None and not pending:
+                if truncated is not None:
+                    truncated.append("stop_after")
+                break
+            current = sections[key]
+            if pending is not None:
+                pending.discard(key)
+        elif current is not None:
+            current.append(line)
+    return sections
+
+
+def _recording(iterable, sink: list):
+    """Yield items from `iterable`, appending each one to `sink` as it passes through."""
+    for item in iterable:
+        sink.append(item)
+        yield item
 
 
 def _parse_contact_info(lines: list[str]) -> tuple[str, str, str]:
@@ -105,31 +316,15 @@ def _parse_name_role(lines: list[str]) -> tuple[str, str]:
             if second and \
                "@" not in second and \
                not re.search(r"\d", second) and \
-               second.lower() not in ["skills", "summary", "education", "experience"]:
+               _heading_text(second) not in _DEFAULT_HEADINGS:
                 role = second
 
     return name, role
 
 
-def _extract_section_text(lines: list[str], heading: str, next_headings: list[str]) -> list[str]:
-    """
-    Given `lines`, find the index of `heading`; then collect all lines until you hit
-    any of the `next_headings`. Return that slice (excluding the heading itself).
-    If heading not found, return [].
-    """
-    start = _find_section(lines, heading)
-    if start < 0:
-        return []
-    result = []
-    for line in lines[start + 1 :]:
-        # Stop if we see any next heading
-        if any(line.lower().startswith(h.lower()) for h in next_headings):
-            break
-        result.append(line)
-    return result
-
-
-def parse_resume(filepath: str) -> dict:
+def parse_resume(filepath: str, max_pages: int | None = None, max_bytes: int | None = None,
+                 stop_after: tuple[str, ...] | None = None,
+                 skill_matcher=None, pdf_workers: int = 1) -> dict:
     """
     Main entry point. Detect file extension, extract raw lines, and then parse:
       - name, role
@@ -138,44 +333,89 @@ def parse_resume(filepath: str) -> dict:
       - summary (lines under “Summary”)
       - education (lines under “Education”)
       - experience (lines under “Experience”)
+      - projects, certifications (lines under those headings)
 
     Returns a dict with keys:
       name, role, email, phone, address, skills, summary,
-      education (list of dicts), experience (list of dicts)
+      education (list of dicts), experience (list of dicts),
+      projects, certifications (lists of lines),
+      truncated (True if part of the document was not read)
+
+    PDFs are streamed page by page, optionally within a `max_pages` / `max_bytes`
+    budget (e.g. PDF_MAX_PAGES / PDF_MAX_BYTES; None reads everything), and reading
+    can stop at the next heading once every section in `stop_after` (e.g. ALL_SECTIONS)
+    has been read; the default None reads on. Any way of stopping early sets "truncated".
+    `pdf_workers` > 1 extracts PDF pages in a process pool, which cuts latency for
+    long single documents (leave at 1 when already running inside a worker pool).
+
+    If a `skill_matcher` (skill_matcher.SkillMatcher) is given, skills mentioned
+    anywhere in the text are merged, canonicalized, into the "Skills" section list.
     """
 
     ext = os.path.splitext(filepath)[1].lower()
-    if ext == ".docx":
-        lines = _extract_from_docx(filepath)
-    elif ext == ".pdf":
-        lines = _extract_from_pdf(filepath)
-    else:
+    if ext not in (".docx", ".pdf"):
         raise ValueError(f"Unsupported resume format: {ext}. Only .docx and .pdf are supported.")
 
+    with instrumentation.trace("parse_resume", source=filepath, format=ext) as trace:
+        if ext == ".docx":
+            with trace.stage("extract"):
+                lines = _extract_from_docx(filepath)
+            with trace.stage("segment"):
+                sections = _segment_sections(lines)
+            truncated = []
+        else:
+            # Extraction and segmentation are interleaved for streamed PDFs
+            lines = []
+            truncated = []
+            with trace.stage("extract_segment"):
+                pdf_lines = _iter_pdf_lines(filepath, max_pages, max_bytes, pdf_workers, truncated)
+                try:
+                    sections = _segment_sections(_recording(pdf_lines, lines), stop_after=stop_after,
+                                                 truncated=truncated)
+                finally:
+                    pdf_lines.close()
+
+        with trace.stage("parse"):
+            parsed = _parse_fields(lines, sections)
+            parsed["truncated"] = bool(truncated)
+
+        if skill_matcher is not None:
+            with trace.stage("skills"):
+                parsed["skills"] = skill_matcher.merge(parsed["skills"], lines)
+
+        if trace.enabled:
+            trace.set(input_bytes=os.path.getsize(filepath), line_count=len(lines), truncated=truncated,
+                      section_counts={key: len(value) for key, value in sections.items()})
+    return parsed
+
+
+def _parse_fields(lines: list[str], sections: dict[str, list[str]]) -> dict:
+    """
+    Build the parse_resume result from the extracted `lines` and their `sections`.
+    """
     # 1) Name & Role
     name, role = _parse_name_role(lines)
 
     # 2) Contact Info
     email, phone, address = _parse_contact_info(lines)
 
-    # 3) Skills – extract lines under “Skills” until next heading
-    skill_lines = _extract_section_text(lines, "Skills", ["Summary", "Education", "Experience"])
+    # 3) Sections were split in one pass over the lines during extraction
+
+    # Skills – lines under “Skills”
     # Split skills by commas if they appear on one line, otherwise treat each line as one skill
     skills = []
-    for sl in skill_lines:
+    for sl in sections["skills"]:
         if "," in sl:
             skills.extend([s.strip() for s in sl.split(",") if s.strip()])
         else:
             skills.append(sl.strip())
 
     # 4) Summary
-    summary_lines = _extract_section_text(lines, "Summary", ["Skills", "Education", "Experience"])
-    summary = "\n".join(summary_lines).strip()
+    summary = "\n".join(sections["summary"]).strip()
 
     # 5) Education – each line treated as “Degree, Institution (YYYY–YYYY)” or similar
-    edu_lines = _extract_section_text(lines, "Education", ["Summary", "Skills", "Experience"])
     education = []
-    for entry in edu_lines:
+    for entry in sections["education"]:
         entry = entry.strip()
         if not entry:
             continue # Skip empty lines
@@ -215,10 +455,9 @@ def parse_resume(filepath: str) -> dict:
                 })
 
     # 6) Experience – collect lines, then break into entries by detecting header lines
-    exp_lines = _extract_section_text(lines, "Experience", ["Summary", "Skills", "Education"])
     experience = []
     current = {"position": "", "company": "", "dates": "", "description": ""}
-    for line in exp_lines:
+    for line in sections["experience"]:
         line = line.strip()
         if not line:
             continue # Skip empty lines
@@ -275,6 +514,10 @@ def parse_resume(filepath: str) -> dict:
     if current["position"]:
         experience.append(current)
 
+    # 7) Projects & Certifications – kept as plain lines
+    projects = sections["projects"]
+    certifications = sections["certifications"]
+
     return {
         "name":       name,
         "role":       role,
@@ -284,5 +527,7 @@ def parse_resume(filepath: str) -> dict:
         "skills":     skills,
         "summary":    summary,
         "education":  education,
-        "experience": experience
+        "experience": experience,
+        "projects":   projects,
+        "certifications": certifications
     }
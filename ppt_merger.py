@@ -1,48 +1,116 @@
-from pptx import Presentation
-from pptx.dml.color import RGBColor
+import copy
+import hashlib
+import io
+import os
+import zipfile
 
-def _copy_font_properties(src_run, dest_run):
-    src_font = src_run.font
-    dst_font = dest_run.font
+import instrumentation
+from text_fit import DEFAULT_FAMILY, TextBox, fit_text
 
-    if src_font.size:
-        dst_font.size = src_font.size
-    if src_font.name:
-        dst_font.name = src_font.name
+# python-pptx is imported on first use (see CompiledTemplate._load) to keep start-up fast.
 
-    dst_font.bold = src_font.bold
-    dst_font.italic = src_font.italic
+# Bump whenever the rendered output changes so cached decks are invalidated.
+RENDERER_VERSION = "6"
 
-    if src_font.color:
-        try:
-            rgb = src_font.color.rgb
-            dst_font.color.rgb = RGBColor(rgb[0], rgb[1], rgb[2])
-        except AttributeError:
-            pass
+_R_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
 
-def _replace_text_preserve_format(shape, new_text: str):
+EMU_PER_PT = 12700
+DEFAULT_FONT_PT = 18.0
+# Placeholders repeated on continuation slides so each one still says whose résumé it is.
+CONTINUATION_KEYS = ("Name", "Role")
+
+# What to do with text that does not fit its placeholder:
+#   "shrink"   - reduce the font within text_fit's limits; text still too long overflows
+#   "continue" - shrink to the smallest allowed size, then continue on copies of the slide
+#   "off"      - fill at the template's size without measuring
+OVERFLOW_MODES = ("shrink", "continue", "off")
+DEFAULT_OVERFLOW = "shrink"
+
+def _replace_text_preserve_format(shape, new_text: str, size_pt: float | None = None):
+    """
+    Replace the shape's text with `new_text`, one paragraph per line. The first run's
+    <a:rPr> is captured once and deep-copied into every new run, so all of its
+    formatting (size, typeface, colour incl. theme colours, underline, ...) carries over.
+    `size_pt` overrides the font size of every run.
+    """
     if not shape.has_text_frame:
         return
 
     tf = shape.text_frame
 
-    src_run = None
+    src_rpr = None
     if tf.paragraphs and tf.paragraphs[0].runs:
-        src_run = tf.paragraphs[0].runs[0]
+        src_rpr = tf.paragraphs[0].runs[0]._r.rPr
 
     tf.clear()
 
     for i, line in enumerate(new_text.split("\n")):
         p = tf.paragraphs[0] if i == 0 else tf.add_paragraph()
-        run = p.add_run()
-        run.text = line
-        if src_run:
-            _copy_font_properties(src_run, run)
+        r = p._p.add_r()
+        r.text = line
+        if src_rpr is not None:
+            r.insert(0, copy.deepcopy(src_rpr))
+        if size_pt is not None:
+            r.get_or_add_rPr().set("sz", str(round(size_pt * 100)))
+
+def _first(element, *paths: str):
+    """Return the first result of the first xpath in `paths` that matches, or None."""
+    for path in paths:
+        found = element.xpath(path)
+        if found:
+            return found[0]
+    return None
+
+def _text_box(shape, shapes, slide_height: int) -> TextBox | None:
+    """
+    Measure the usable text area of `shape` (box minus insets) and the font it starts
+    with. A shape that grows with its text (<a:spAutoFit/>) may grow down to the next
+    shape beneath it or to the bottom of the slide. Returns None for shapes without
+    their own geometry.
+    """
+    if None in (shape.left, shape.top, shape.width, shape.height):
+        return None
+    tx_body = shape.text_frame._txBody
+    body_pr = tx_body.bodyPr
+
+    height = shape.height
+    if body_pr.xpath("./a:spAutoFit"):
+        bottom = slide_height
+        right = shape.left + shape.width
+        for other in shapes:
+            if other is shape or None in (other.left, other.top, other.width):
+                continue
+            if other.top > shape.top and other.left < right and shape.left < other.left + other.width:
+                bottom = min(bottom, other.top)
+        height = max(height, bottom - shape.top)
+    height -= int(body_pr.get("tIns", 45720)) + int(body_pr.get("bIns", 45720))
+    if body_pr.get("wrap") == "none":
+        width_pt = float("inf")
+    else:
+        width_pt = (shape.width - int(body_pr.get("lIns", 91440)) - int(body_pr.get("rIns", 91440))) / EMU_PER_PT
 
-def merge_into_template(parsed: dict, template_pptx_path: str, output_path: str):
-    prs = Presentation(template_pptx_path)
-    slide = prs.slides[0]
+    size = _first(tx_body, "./a:p/a:r/a:rPr/@sz", "./a:lstStyle/a:lvl1pPr/a:defRPr/@sz")
+    bold = _first(tx_body, "./a:p/a:r/a:rPr/@b", "./a:lstStyle/a:lvl1pPr/a:defRPr/@b")
+    font = _first(tx_body, "./a:p/a:r/a:rPr/a:latin/@typeface",
+                  "./a:lstStyle/a:lvl1pPr/a:defRPr/a:latin/@typeface")
+    spacing = _first(tx_body, "./a:p[1]/a:pPr/a:lnSpc/a:spcPct/@val",
+                     "./a:lstStyle/a:lvl1pPr/a:lnSpc/a:spcPct/@val")
+    if spacing is None:
+        line_spacing = 1.0
+    elif spacing.endswith("%"):
+        line_spacing = float(spacing[:-1]) / 100
+    else:
+        line_spacing = int(spacing) / 100000
+    return TextBox(
+        width_pt=max(width_pt, 1.0),
+        height_pt=max(height, 0) / EMU_PER_PT,
+        font=font if font and not font.startswith("+") else DEFAULT_FAMILY,  # "+mn-lt": theme font
+        size_pt=int(size) / 100 if size else DEFAULT_FONT_PT,
+        bold=bold in ("1", "true"),
+        line_spacing=line_spacing,
+    )
 
+def _build_content_map(parsed: dict) -> dict:
     # Prepare experience text
     exp_lines = []
     for exp in parsed.get("experience", []):
@@ -64,7 +132,7 @@ def merge_into_template(parsed: dict, template_pptx_path: str, output_path: str)
         edu_lines.append(line)
     education_text = "\n".join(edu_lines).strip()
 
-    content_map = {
+    return {
         "Name": parsed.get("name", ""),
         "Role": parsed.get("role", ""),
         "Email": parsed.get("email", ""),
@@ -76,12 +144,262 @@ def merge_into_template(parsed: dict, template_pptx_path: str, output_path: str)
         "Education": education_text
     }
 
-    for shape in slide.shapes:
-        if shape.has_text_frame:
-            current_text = shape.text_frame.text.strip()
-            for key, value in content_map.items():
-                if current_text.lower() == key.lower():
-                    _replace_text_preserve_format(shape, value)
-                    break  # Stop after first match
 
-    prs.save(output_path)
+def _archive_without(data: bytes, skip_member: str) -> bytes:
+    """Return a zip archive holding every member of `data` except `skip_member`."""
+    buf = io.BytesIO()
+    with zipfile.ZipFile(io.BytesIO(data)) as src, zipfile.ZipFile(buf, "w") as dst:
+        for info in src.infolist():
+            if info.filename != skip_member:
+                dst.writestr(info, src.read(info))
+    return buf.getvalue()
+
+
+class CompiledTemplate:
+    """
+    A template loaded once and kept in memory.
+
+    The package is parsed a single time and the placeholder shapes on the first slide
+    are indexed by content-map key, together with the text box each one offers. Each
+    `build` restores the pristine shape tree and fills the indexed shapes, so no
+    per-résumé disk read or text matching is needed. Text that does not fit its box
+    is handled according to the `overflow` mode (see OVERFLOW_MODES).
+    The returned Presentation is reused between calls, so save it before building the
+    next one. Instances are not thread-safe; use one per process.
+    """
+
+    def __init__(self, template_pptx_path: str):
+        self.path = template_pptx_path
+        self._load()
+
+    def _stat_signature(self) -> tuple[int, int]:
+        st = os.stat(self.path)
+        return st.st_mtime_ns, st.st_size
+
+    def _load(self):
+        from pptx import Presentation
+
+        signature = self._stat_signature()
+        with open(self.path, "rb") as fh:
+            data = fh.read()
+        self.digest = hashlib.sha256(data).hexdigest()
+        self._data = data
+        self._signature = signature
+        self._prs = Presentation(io.BytesIO(data))
+        self._slide = self._prs.slides[0]
+        self._slide_member = self._slide.part.partname.lstrip("/")
+        self._static_archive = _archive_without(data, self._slide_member)
+        self._pristine = [copy.deepcopy(child) for child in self._slide.shapes._spTree]
+        self._slide_count = len(self._prs.slides)
+
+        # Index placeholder shapes by their position in the shape tree
+        keys = {k.lower(): k for k in _build_content_map({})}
+        shapes = list(self._slide.shapes)
+        self._placeholders = []
+        self._boxes = {}
+        for idx, shape in enumerate(shapes):
+            if shape.has_text_frame:
+                key = keys.get(shape.text_frame.text.strip().lower())
+                if key:
+                    self._placeholders.append((idx, key))
+                    self._boxes[idx] = _text_box(shape, shapes, self._prs.slide_height)
+
+    def is_stale(self) -> bool:
+        """Return True if the template file changed on disk since it was loaded."""
+        return self._stat_signature() != self._signature
+
+    def reload_if_changed(self) -> bool:
+        """Reload the template if the file changed. Returns True if it was reloaded."""
+        if self.is_stale():
+            self._load()
+            return True
+        return False
+
+    def _restore(self):
+        # Drop continuation slides added by the previous build
+        sld_ids = self._prs.slides._sldIdLst
+        for sld_id in list(sld_ids)[self._slide_count:]:
+            sld_ids.remove(sld_id)
+            self._prs.part.drop_rel(sld_id.rId)
+
+        # Swap children in place: the slide's shape collection keeps its spTree reference
+        sp_tree = self._slide.shapes._spTree
+        for child in list(sp_tree):
+            sp_tree.remove(child)
+        for child in self._pristine:
+            sp_tree.append(copy.deepcopy(child))
+
+    def _texts(self, parsed: dict) -> dict[int, list[str]]:
+        content_map = _build_content_map(parsed)
+        return {idx: content_map[key].split("\n") for idx, key in self._placeholders}
+
+    def _fill(self, slide, texts: dict[int, list[str]], overflow_mode: str) -> dict[int, list[str]]:
+        """
+        Fill each placeholder on `slide`, shrinking the font where the text does not fit
+        (unless `overflow_mode` is "off"). In "continue" mode only as many paragraphs as
+        fit are placed. Placeholders missing from `texts` are emptied. Returns the
+        paragraphs that were not placed, by shape index.
+        """
+        shapes = list(slide.shapes)
+        overflow = {}
+        for idx, key in self._placeholders:
+            paragraphs = texts.get(idx, [""])
+            box = self._boxes[idx] if overflow_mode != "off" else None
+            size = None
+            if box is not None:
+                fitted_size, paragraphs, rest = fit_text(paragraphs, box,
+                                                         split=overflow_mode == "continue")
+                while rest and not rest[0].strip():
+                    rest.pop(0)
+                if rest:
+                    overflow[idx] = rest
+                if fitted_size != box.size_pt:
+                    size = fitted_size
+            _replace_text_preserve_format(shapes[idx], "\n".join(paragraphs), size)
+        return overflow
+
+    def _fill_with_overflow(self, prs, slide, parsed: dict, overflow_mode: str):
+        """
+        Fill `slide` from `parsed`. In "continue" mode, append continuation slides to
+        `prs` until all text is placed; they repeat the CONTINUATION_KEYS placeholders,
+        carry the overflowing text and leave the other placeholders empty.
+        """
+        if overflow_mode not in OVERFLOW_MODES:
+            raise ValueError(f"Unknown overflow mode: {overflow_mode!r}. Use one of {OVERFLOW_MODES}.")
+        texts = self._texts(parsed)
+        overflow = self._fill(slide, texts, overflow_mode)
+        repeated = {idx: texts[idx] for idx, key in self._placeholders if key in CONTINUATION_KEYS}
+        while overflow:
+            # Every pass places at least one paragraph per carried placeholder, so this ends
+            carried = set(overflow)
+            slide = self._duplicate_first_slide(prs)
+            overflow = self._fill(slide, {**repeated, **overflow}, overflow_mode)
+            overflow = {idx: rest for idx, rest in overflow.items() if idx in carried}
+
+    def build(self, parsed: dict, overflow: str = DEFAULT_OVERFLOW):
+        """
+        Return the template Presentation with its first slide filled from `parsed`,
+        followed by any continuation slides (`overflow="continue"` only).
+        """
+        self._restore()
+        self._fill_with_overflow(self._prs, self._slide, parsed, overflow)
+        return self._prs
+
+    def _duplicate_first_slide(self, prs):
+        """
+        Append a copy of the pristine first slide to `prs`. The copy uses the same
+        layout and relates to the same image/media parts, so nothing is duplicated in
+        the package except the slide XML itself. Notes are not copied.
+        """
+        from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+
+        source = prs.slides[0]
+        slide = prs.slides.add_slide(source.slide_layout)
+        sp_tree = slide.shapes._spTree
+        for child in list(sp_tree):
+            sp_tree.remove(child)
+        for child in self._pristine:
+            sp_tree.append(copy.deepcopy(child))
+
+        # Re-point relationship ids (pictures, hyperlinks, ...) at the shared parts
+        rid_map = {}
+        for rel in source.part.rels.values():
+            if rel.reltype in (RT.SLIDE_LAYOUT, RT.NOTES_SLIDE):
+                continue
+            if rel.is_external:
+                rid_map[rel.rId] = slide.part.relate_to(rel.target_ref, rel.reltype, is_external=True)
+            else:
+                rid_map[rel.rId] = slide.part.relate_to(rel.target_part, rel.reltype)
+        if rid_map:
+            for element in sp_tree.iter():
+                for attr, value in element.attrib.items():
+                    if attr.startswith(_R_NS) and value in rid_map:
+                        element.set(attr, rid_map[value])
+        return slide
+
+    def build_deck(self, parsed_list: list[dict], overflow: str = DEFAULT_OVERFLOW):
+        """
+        Return a new Presentation with one filled copy of the template's first slide
+        per entry in `parsed_list`, in order, each followed by its continuation slides
+        (`overflow="continue"` only). Layouts, masters and media are shared.
+        """
+        from pptx import Presentation
+
+        prs = Presentation(io.BytesIO(self._data))
+        for i, parsed in enumerate(parsed_list):
+            slide = prs.slides[0] if i == 0 else self._duplicate_first_slide(prs)
+            self._fill_with_overflow(prs, slide, parsed, overflow)
+        return prs
+
+    def save(self, output_path: str):
+        """
+        Write the most recently built Presentation to `output_path`.
+
+        Only the first slide differs from the template, so instead of re-serializing
+        the whole package the prebuilt archive of unchanged template parts is copied
+        byte for byte and just the slide XML is compressed and appended. Builds that
+        added continuation slides are saved in full.
+        """
+        if len(self._prs.slides) > self._slide_count:
+            self._prs.save(output_path)
+            return
+        with open(output_path, "wb") as fh:
+            fh.write(self._static_archive)
+        with zipfile.ZipFile(output_path, "a", zipfile.ZIP_DEFLATED) as zf:
+            zf.writestr(self._slide_member, self._slide.part.blob)
+
+    def render(self, parsed: dict, output_path: str, overflow: str = DEFAULT_OVERFLOW):
+        self.build(parsed, overflow)
+        self.save(output_path)
+
+
+_TEMPLATE_CACHE: dict[str, CompiledTemplate] = {}
+
+
+def get_compiled_template(template_pptx_path: str) -> CompiledTemplate:
+    """
+    Return the cached CompiledTemplate for `template_pptx_path`, loading it on first
+    use and reloading it when the file has changed.
+    """
+    key = os.path.abspath(template_pptx_path)
+    template = _TEMPLATE_CACHE.get(key)
+    if template is None:
+        template = _TEMPLATE_CACHE[key] = CompiledTemplate(template_pptx_path)
+    else:
+        template.reload_if_changed()
+    return template
+
+
+def merge_into_template(parsed: dict, template_pptx_path: str, output_path: str,
+                        overflow: str = DEFAULT_OVERFLOW):
+    with instrumentation.trace("merge_into_template", template=template_pptx_path) as trace:
+        with trace.stage("template_load"):
+            template = get_compiled_template(template_pptx_path)
+        with trace.stage("fill"):
+            prs = template.build(parsed, overflow)
+        with trace.stage("save"):
+            template.save(output_path)
+
+        if trace.enabled:
+            trace.set(shapes_filled=len(template._placeholders), slides=len(prs.slides),
+                      output_bytes=os.path.getsize(output_path))
+
+
+def merge_many_into_template(parsed_list: list[dict], template_pptx_path: str, output_path: str,
+                             overflow: str = DEFAULT_OVERFLOW):
+    """
+    Render every parsed résumé onto its own slide of a single deck and save it once.
+    """
+    if not parsed_list:
+        raise ValueError("merge_many_into_template needs at least one parsed résumé")
+
+    with instrumentation.trace("merge_many_into_template", template=template_pptx_path) as trace:
+        with trace.stage("template_load"):
+            template = get_compiled_template(template_pptx_path)
+        with trace.stage("fill"):
+            prs = template.build_deck(parsed_list, overflow)
+        with trace.stage("save"):
+            prs.save(output_path)
+
+        if trace.enabled:
+            trace.set(resumes=len(parsed_list), slides=len(prs.slides), output_bytes=os.path.getsize(output_path))
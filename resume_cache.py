@@ -0,0 +1,148 @@
+# resume_cache.py
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+from parser import PARSER_VERSION, parse_resume
+from ppt_merger import DEFAULT_OVERFLOW, RENDERER_VERSION, get_compiled_template
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+# A cache that outgrows max_bytes is pruned down to this fraction of it, so the writes
+# that follow don't each rescan the whole directory.
+PRUNE_TO = 0.9
+_CHUNK = 1024 * 1024
+
+
+def _sha256_file(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(_CHUNK), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _sha256_parsed(parsed: dict) -> str:
+    blob = json.dumps(parsed, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return hashlib.sha256(blob).hexdigest()
+
+
+class ResumeCache:
+    """
+    Content-addressed, size-bounded on-disk cache with two levels:
+
+      - parsed/<sha256(input bytes) + parser version>.json  -> parse_resume output
+      - rendered/<sha256(parsed dict) + template hash>.pptx -> merge_into_template output
+
+    Entries are evicted least-recently-used first (a hit refreshes the file's mtime)
+    once the cache grows beyond `max_bytes`, down to PRUNE_TO of it. Writes are
+    atomic, so several processes can share one cache directory. `stats` counts hits and misses per level.
+    """
+
+    def __init__(self, root: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.stats = {"parse_hits": 0, "parse_misses": 0, "render_hits": 0, "render_misses": 0}
+        self._parsed_dir = os.path.join(root, "parsed")
+        self._rendered_dir = os.path.join(root, "rendered")
+        os.makedirs(self._parsed_dir, exist_ok=True)
+        os.makedirs(self._rendered_dir, exist_ok=True)
+        self._size = sum(size for _, _, size in self._entries())
+
+    def _entries(self):
+        """Yield (path, mtime, size) for every cache entry."""
+        for directory in (self._parsed_dir, self._rendered_dir):
+            with os.scandir(directory) as it:
+                for entry in it:
+                    if entry.is_file() and not entry.name.startswith("."):
+                        try:
+                            st = entry.stat()
+                        except FileNotFoundError:
+                            continue  # evicted by another process
+                        yield entry.path, st.st_mtime_ns, st.st_size
+
+    def _touch(self, path: str):
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+    def _store(self, directory: str, name: str, write):
+        """Atomically create `directory/name` by calling `write(tmp_path)`."""
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+        os.close(fd)
+        try:
+            write(tmp_path)
+            self._size += os.path.getsize(tmp_path)
+            os.replace(tmp_path, os.path.join(directory, name))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        if self._size > self.max_bytes:
+            self.prune()
+
+    def prune(self):
+        """
+        If the cache is larger than `max_bytes`, evict least-recently-used entries
+        until it fits in PRUNE_TO * `max_bytes`.
+        """
+        entries = list(self._entries())
+        total = sum(size for _, _, size in entries)
+        if total > self.max_bytes:
+            for path, _, size in sorted(entries, key=lambda e: e[1]):
+                if total <= self.max_bytes * PRUNE_TO:
+                    break
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                total -= size
+        self._size = total
+
+    def parse(self, filepath: str, skill_matcher=None) -> dict:
+        """parse_resume(filepath), served from the cache when the same bytes were seen."""
+        ext = os.path.splitext(filepath)[1].lower()
+        key = f"{_sha256_file(filepath)}-{PARSER_VERSION}"
+        if skill_matcher is not None:
+            key += f"-{skill_matcher.digest}"
+        key += f"{ext}.json"
+        path = os.path.join(self._parsed_dir, key)
+        try:
+            with open(path, encoding="utf-8") as fh:
+                parsed = json.load(fh)
+        except (FileNotFoundError, ValueError):
+            pass
+        else:
+            self.stats["parse_hits"] += 1
+            self._touch(path)
+            return parsed
+
+        self.stats["parse_misses"] += 1
+        parsed = parse_resume(filepath, skill_matcher=skill_matcher)
+
+        def write(tmp_path):
+            with open(tmp_path, "w", encoding="utf-8") as fh:
+                json.dump(parsed, fh, ensure_ascii=False)
+        self._store(self._parsed_dir, key, write)
+        return parsed
+
+    def render(self, parsed: dict, template_path: str, output_path: str, overflow: str = DEFAULT_OVERFLOW):
+        """merge_into_template(...), copying a cached deck when one already exists."""
+        template = get_compiled_template(template_path)
+        key = f"{_sha256_parsed(parsed)}-{template.digest}-{RENDERER_VERSION}-{overflow}.pptx"
+        path = os.path.join(self._rendered_dir, key)
+        try:
+            shutil.copyfile(path, output_path)
+        except FileNotFoundError:
+            pass
+        else:
+            self.stats["render_hits"] += 1
+            self._touch(path)
+            return
+
+        self.stats["render_misses"] += 1
+        template.render(parsed, output_path, overflow)
+        self._store(self._rendered_dir, key, lambda tmp_path: shutil.copyfile(output_path, tmp_path))
@@ -0,0 +1,295 @@
+# server.py
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from parser import parse_resume
+from ppt_merger import get_compiled_template
+
+DEFAULT_TEMPLATE   = "Final Template.pptx"
+DEFAULT_QUEUE_SIZE = 32
+DEFAULT_TIMEOUT    = 60.0
+MAX_UPLOAD_BYTES   = 20 * 1024 * 1024
+
+PPTX_MIME = "application/vnd.openxmlformats-officedocument.presentationml.presentation"
+UPLOAD_TYPES = {
+    "application/pdf": ".pdf",
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document": ".docx",
+}
+
+
+# --- worker side ---------------------------------------------------------------
+
+def _init_worker(template_path: str):
+    """Warm each worker: load the template (and python-pptx) before the first request."""
+    get_compiled_template(template_path)
+
+
+def _parse_upload(data: bytes, ext: str) -> dict:
+    fd, path = tempfile.mkstemp(suffix=ext)
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(data)
+        return parse_resume(path)
+    finally:
+        os.remove(path)
+
+
+def _format_upload(data: bytes, ext: str, template_path: str) -> bytes:
+    parsed = _parse_upload(data, ext)
+    fd, path = tempfile.mkstemp(suffix=".pptx")
+    os.close(fd)
+    try:
+        get_compiled_template(template_path).render(parsed, path)
+        with open(path, "rb") as fh:
+            return fh.read()
+    finally:
+        os.remove(path)
+
+
+# --- HTTP side -----------------------------------------------------------------
+
+class FormattingServer(ThreadingHTTPServer):
+    """
+    HTTP front end over a warm process pool.
+
+    At most `workers + queue_size` requests are admitted at once; any request beyond
+    that is rejected immediately with 429 instead of piling up. Each admitted request
+    waits at most `timeout` seconds for its result (504 otherwise). A request keeps its
+    slot until the worker really finishes, so timed-out jobs still count against the
+    bound.
+
+    A pool whose worker died (BrokenProcessPool) is replaced and the affected requests
+    get 503. A job that exceeds the timeout is presumed hung: its pool is replaced and
+    the old workers are killed, which frees their slots; other jobs still running on
+    the old pool get 503 too.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address, template_path: str, workers: int | None = None,
+                 queue_size: int = DEFAULT_QUEUE_SIZE, timeout: float = DEFAULT_TIMEOUT,
+                 max_upload: int = MAX_UPLOAD_BYTES):
+        super().__init__(address, FormattingHandler)
+        self.template_path = template_path
+        self.timeout_s = timeout
+        self.max_upload = max_upload
+        self.workers = workers or os.cpu_count() or 1
+        self.pool = self._new_pool()
+        # Workers are spawned on demand; start them all now so the first requests
+        # don't pay for process start-up and template loading.
+        for future in [self.pool.submit(os.getpid) for _ in range(self.workers)]:
+            future.result()
+        self.capacity = self.workers + queue_size
+        self._slots = threading.BoundedSemaphore(self.capacity)
+        self._lock = threading.Lock()
+        self._pool_of = {}  # in-flight future -> the pool running it
+        self.in_flight = 0
+        self.pool_restarts = 0
+
+    def _new_pool(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                   initargs=(self.template_path,))
+
+    def submit(self, fn, *args):
+        """
+        Submit a job if there is room, else return None. Raises BrokenProcessPool
+        (after replacing the pool) if the pool has lost a worker.
+        """
+        if not self._slots.acquire(blocking=False):
+            return None
+        with self._lock:
+            self.in_flight += 1
+            pool = self.pool
+        try:
+            future = pool.submit(fn, *args)
+        except BaseException as e:
+            self._release(None)
+            if isinstance(e, BrokenProcessPool):
+                self.replace_pool(pool)
+            raise
+        with self._lock:
+            self._pool_of[future] = pool
+        future.add_done_callback(self._release)
+        return future
+
+    def _release(self, future):
+        with self._lock:
+            self.in_flight -= 1
+            self._pool_of.pop(future, None)
+        self._slots.release()
+
+    def replace_pool(self, pool: ProcessPoolExecutor):
+        """
+        Swap in a fresh pool if `pool` is still the current one, then shut `pool` down
+        and kill its workers. Jobs still running on it fail with BrokenProcessPool,
+        which releases their slots.
+        """
+        with self._lock:
+            if self.pool is not pool:
+                return
+            self.pool = self._new_pool()
+            self.pool_restarts += 1
+            for _ in range(self.workers):
+                self.pool.submit(os.getpid)  # spawn the new workers without waiting
+        # ProcessPoolExecutor has no public way to stop a running task
+        processes = list((getattr(pool, "_processes", None) or {}).values())
+        pool.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            process.terminate()
+
+    def recycle(self, future):
+        """Replace the pool that is running `future` (used when the job hangs)."""
+        with self._lock:
+            pool = self._pool_of.get(future)
+        if pool is not None:
+            self.replace_pool(pool)
+
+    def check_pool(self) -> bool:
+        """Return False, after replacing it, if the current pool has lost a worker."""
+        with self._lock:
+            pool = self.pool
+        try:
+            pool.submit(os.getpid)
+        except BrokenProcessPool:
+            self.replace_pool(pool)
+            return False
+        return True
+
+    def server_close(self):
+        super().server_close()
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+
+class FormattingHandler(BaseHTTPRequestHandler):
+    """
+    POST /parse   body = résumé bytes  -> parse_resume JSON
+    POST /format  body = résumé bytes  -> formatted PPTX
+    GET  /health                       -> pool status (503 while a broken pool is replaced)
+
+    The file type comes from `?filename=<name>.docx|.pdf` or the Content-Type header.
+    """
+
+    server: FormattingServer
+
+    def do_GET(self):
+        if urlparse(self.path).path != "/health":
+            return self._send_error(HTTPStatus.NOT_FOUND, "unknown endpoint")
+        healthy = self.server.check_pool()
+        self._send_json(HTTPStatus.OK if healthy else HTTPStatus.SERVICE_UNAVAILABLE,
+                        {"status": "ok" if healthy else "restarting",
+                         "in_flight": self.server.in_flight,
+                         "capacity": self.server.capacity,
+                         "pool_restarts": self.server.pool_restarts})
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        if url.path not in ("/parse", "/format"):
+            return self._send_error(HTTPStatus.NOT_FOUND, "unknown endpoint")
+
+        ext = self._upload_ext(parse_qs(url.query))
+        if ext is None:
+            return self._send_error(HTTPStatus.UNSUPPORTED_MEDIA_TYPE,
+                                    "send a .docx or .pdf (set ?filename= or Content-Type)")
+        length = int(self.headers.get("Content-Length") or 0)
+        if length <= 0:
+            return self._send_error(HTTPStatus.LENGTH_REQUIRED, "empty upload")
+        if length > self.server.max_upload:
+            return self._send_error(HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                                    f"upload exceeds {self.server.max_upload} bytes")
+        data = self.rfile.read(length)
+
+        try:
+            if url.path == "/parse":
+                future = self.server.submit(_parse_upload, data, ext)
+            else:
+                future = self.server.submit(_format_upload, data, ext, self.server.template_path)
+        except BrokenProcessPool:
+            return self._send_error(HTTPStatus.SERVICE_UNAVAILABLE, "worker pool restarted, retry",
+                                    headers={"Retry-After": "1"})
+        if future is None:
+            return self._send_error(HTTPStatus.TOO_MANY_REQUESTS, "server busy, retry later",
+                                    headers={"Retry-After": "1"})
+
+        try:
+            result = future.result(timeout=self.server.timeout_s)
+        except TimeoutError:
+            if not future.cancel():
+                self.server.recycle(future)  # running: the worker is stuck
+            return self._send_error(HTTPStatus.GATEWAY_TIMEOUT, "formatting timed out")
+        except BrokenProcessPool:
+            self.server.check_pool()
+            return self._send_error(HTTPStatus.SERVICE_UNAVAILABLE, "worker process died, retry",
+                                    headers={"Retry-After": "1"})
+        except ValueError as e:
+            return self._send_error(HTTPStatus.UNSUPPORTED_MEDIA_TYPE, str(e))
+        except Exception as e:
+            return self._send_error(HTTPStatus.UNPROCESSABLE_ENTITY, f"{type(e).__name__}: {e}")
+
+        if url.path == "/parse":
+            self._send_json(HTTPStatus.OK, result)
+        else:
+            self._send(HTTPStatus.OK, result, PPTX_MIME)
+
+    def _upload_ext(self, query: dict) -> str | None:
+        filename = (query.get("filename") or [""])[0]
+        ext = os.path.splitext(filename)[1].lower()
+        if ext in (".docx", ".pdf"):
+            return ext
+        content_type = (self.headers.get("Content-Type") or "").split(";")[0].strip().lower()
+        return UPLOAD_TYPES.get(content_type)
+
+    def _send(self, status, body: bytes, content_type: str, headers: dict | None = None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, status, payload, headers: dict | None = None):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self._send(status, body, "application/json; charset=utf-8", headers)
+
+    def _send_error(self, status, message: str, headers: dict | None = None):
+        self._send_json(status, {"error": message}, headers)
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description="Serve résumé parsing/formatting over HTTP.")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8080)
+    ap.add_argument("-t", "--template", default=DEFAULT_TEMPLATE, help="PPTX template path")
+    ap.add_argument("-j", "--workers", type=int, default=None,
+                    help="worker processes (default: CPU count)")
+    ap.add_argument("--queue-size", type=int, default=DEFAULT_QUEUE_SIZE,
+                    help="requests allowed to wait for a worker before answering 429")
+    ap.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT,
+                    help="seconds to wait for a result before answering 504")
+    args = ap.parse_args(argv)
+
+    server = FormattingServer((args.host, args.port), args.template, args.workers,
+                              args.queue_size, args.timeout)
+    print(f"Serving on http://{args.host}:{server.server_address[1]} "
+          f"({server.capacity} concurrent requests)", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,132 @@
+# skill_matcher.py
+
+import functools
+import hashlib
+import json
+from collections import deque
+
+
+class SkillMatcher:
+    """
+    Finds taxonomy skills anywhere in a résumé with an Aho-Corasick automaton.
+
+    `taxonomy` maps each canonical skill name to its aliases, e.g.
+    {"JavaScript": ["js", "ecmascript"], "Kubernetes": ["k8s"]}. The canonical name is
+    always matched too. All terms are compiled once into a single automaton, so a
+    scan is one linear pass over the text no matter how many terms there are.
+    Matching is case-insensitive, respects word boundaries on alphanumeric edges,
+    and prefers the longest term where matches overlap.
+    """
+
+    def __init__(self, taxonomy: dict[str, list[str]], digest: str | None = None):
+        self.digest = digest or hashlib.sha256(
+            json.dumps(taxonomy, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+        self._canonical = list(taxonomy)
+        self._alias_to_index = {}
+        for idx, canonical in enumerate(self._canonical):
+            for term in (canonical, *taxonomy[canonical]):
+                term = " ".join(term.lower().split())
+                if term:
+                    self._alias_to_index.setdefault(term, idx)
+        self._build()
+
+    @classmethod
+    def from_file(cls, path: str) -> "SkillMatcher":
+        """
+        Load a taxonomy from JSON: either {canonical: [aliases, ...]} or a plain list
+        of skill names.
+        """
+        with open(path, "rb") as fh:
+            raw = fh.read()
+        data = json.loads(raw)
+        if isinstance(data, list):
+            data = {name: [] for name in data}
+        return cls(data, digest=hashlib.sha256(raw).hexdigest())
+
+    def _build(self):
+        # goto[n]: char -> child node; out[n]: (canonical index, term length) ending at n
+        goto = [{}]
+        out = [[]]
+        for term, idx in self._alias_to_index.items():
+            node = 0
+            for ch in term:
+                nxt = goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[node][ch] = nxt
+                    goto.append({})
+                    out.append([])
+                node = nxt
+            out[node].append((idx, len(term)))
+
+        # Breadth-first failure links; each node inherits the outputs of its fail node
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in goto[node].items():
+                queue.append(child)
+                f = fail[node]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[child] = goto[f].get(ch, 0)
+                out[child].extend(out[fail[child]])
+        self._goto = goto
+        self._fail = fail
+        self._out = out
+
+    def canonical(self, term: str) -> str | None:
+        """Return the canonical name for an exact skill or alias, or None."""
+        idx = self._alias_to_index.get(" ".join(term.lower().split()))
+        return None if idx is None else self._canonical[idx]
+
+    def _matches(self, text: str):
+        """Yield (start, end, canonical index) for every term occurrence in `text`."""
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        for pos, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            for idx, length in out[node]:
+                yield pos + 1 - length, pos + 1, idx
+
+    def find(self, lines: list[str]) -> list[str]:
+        """Return the canonical skills mentioned in `lines`, deduplicated, in order of first mention."""
+        text = "\n".join(" ".join(line.lower().split()) for line in lines)
+        hits = []
+        for start, end, idx in self._matches(text):
+            if start > 0 and text[start].isalnum() and text[start - 1].isalnum():
+                continue
+            if end < len(text) and text[end - 1].isalnum() and text[end].isalnum():
+                continue
+            hits.append((start, -(end - start), idx))
+
+        # Leftmost-longest, non-overlapping
+        found = {}
+        last_end = 0
+        for start, neg_length, idx in sorted(hits):
+            if start >= last_end:
+                found.setdefault(idx, None)
+                last_end = start - neg_length
+        return [self._canonical[idx] for idx in found]
+
+    def merge(self, section_skills: list[str], lines: list[str]) -> list[str]:
+        """
+        Canonicalize the skills listed under the Skills heading, then append every
+        taxonomy skill found elsewhere in `lines`. Duplicates are dropped case-insensitively.
+        """
+        merged = []
+        seen = set()
+        for skill in section_skills + self.find(lines):
+            skill = self.canonical(skill) or skill
+            if skill.lower() not in seen:
+                seen.add(skill.lower())
+                merged.append(skill)
+        return merged
+
+
+@functools.lru_cache(maxsize=8)
+def load_skill_matcher(path: str) -> SkillMatcher:
+    """Compile the taxonomy at `path` once per process."""
+    return SkillMatcher.from_file(path)
@@ -0,0 +1,83 @@
+# startup_check.py
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+# Entry-point modules and their cumulative import-time budget in milliseconds.
+BUDGETS_MS = {
+    "gui":        150,
+    "batch":      150,
+    "parser":     60,
+    "ppt_merger": 60,
+}
+
+# Document backends that must only be imported when a file of that format is processed.
+LAZY_BACKENDS = ("docx", "pptx", "PyPDF2", "lxml")
+
+
+def measure_import(module: str) -> tuple[float, set[str]]:
+    """
+    Import `module` in a fresh interpreter with `-X importtime`. Returns the module's
+    cumulative import time in milliseconds and the set of top-level packages imported.
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, check=True,
+    )
+    cumulative_us = 0
+    imported = set()
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|", 2)
+        if not cumulative.strip().isdigit():
+            continue  # header line
+        name = name.strip()
+        imported.add(name.split(".", 1)[0])
+        if name == module:
+            cumulative_us = int(cumulative)
+    return cumulative_us / 1000, imported
+
+
+def check(modules: list[str], runs: int, scale: float) -> list[str]:
+    """Return a message for every budget or lazy-loading violation."""
+    problems = []
+    for module in modules:
+        samples = []
+        imported = set()
+        for _ in range(runs):
+            ms, imported = measure_import(module)
+            samples.append(ms)
+        median = statistics.median(samples)
+        budget = BUDGETS_MS[module] * scale
+        eager = sorted(imported.intersection(LAZY_BACKENDS))
+        print(f"{module:<12} {median:7.1f} ms (budget {budget:.0f} ms)"
+              + (f"  eager: {', '.join(eager)}" if eager else ""))
+        if median > budget:
+            problems.append(f"{module}: import took {median:.1f} ms, budget is {budget:.0f} ms")
+        if eager:
+            problems.append(f"{module}: imports document backends at start-up: {', '.join(eager)}")
+    return problems
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description="Enforce the start-up import-time budget.")
+    ap.add_argument("modules", nargs="*", help=f"modules to check (default: {', '.join(BUDGETS_MS)})")
+    ap.add_argument("-n", "--runs", type=int, default=5, help="fresh interpreters per module")
+    ap.add_argument("--scale", type=float, default=1.0,
+                    help="multiply every budget, e.g. 2.0 on slow CI machines")
+    args = ap.parse_args(argv)
+    unknown = [m for m in args.modules if m not in BUDGETS_MS]
+    if unknown:
+        ap.error(f"no budget for: {', '.join(unknown)}")
+
+    problems = check(args.modules or list(BUDGETS_MS), args.runs, args.scale)
+    for message in problems:
+        print(f"FAIL {message}", file=sys.stderr)
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,164 @@
+# text_fit.py
+
+import bisect
+import functools
+import math
+
+# Advance widths of Helvetica/Arial in 1/1000 em for printable ASCII (Adobe AFM metrics).
+# Other families are approximated by scaling this table; characters outside it use
+# DEFAULT_WIDTH. Good enough to decide whether text fits without a renderer.
+HELVETICA_WIDTHS = dict(zip(
+    " !\"#$%&'()*+,-./0123456789:;<=>?@ABCDEFGHIJKLMNOPQRSTUVWXYZ[\\]^_`abcdefghijklmnopqrstuvwxyz{|}~",
+    (278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278,
+     556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 278, 278, 584, 584, 584, 556,
+     1015, 667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833, 722, 778,
+     667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278, 278, 278, 469, 556,
+     333, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556,
+     556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584),
+))
+DEFAULT_WIDTH = 556
+
+# Average width of common families relative to Helvetica.
+FAMILY_SCALE = {
+    "arial":           1.00,
+    "helvetica":       1.00,
+    "calibri":         0.90,
+    "cambria":         0.95,
+    "candara":         0.92,
+    "segoe ui":        1.02,
+    "tahoma":          0.98,
+    "verdana":         1.12,
+    "georgia":         1.05,
+    "garamond":        0.88,
+    "times new roman": 0.89,
+}
+DEFAULT_FAMILY = "calibri"
+BOLD_SCALE = 1.06
+
+LINE_HEIGHT = 1.2       # line pitch as a multiple of the font size
+MIN_FONT_PT = 8.0       # never shrink below this...
+MIN_SCALE = 0.7         # ...or below this fraction of the template's size
+SIZE_STEP_PT = 0.5
+
+
+class TextBox:
+    """The usable text area of a shape and the text style the template gives it."""
+
+    __slots__ = ("width_pt", "height_pt", "font", "size_pt", "bold", "line_spacing")
+
+    def __init__(self, width_pt: float, height_pt: float, font: str, size_pt: float,
+                 bold: bool = False, line_spacing: float = 1.0):
+        self.width_pt = width_pt
+        self.height_pt = height_pt
+        self.font = font
+        self.size_pt = size_pt
+        self.bold = bold
+        self.line_spacing = line_spacing
+
+
+@functools.lru_cache(maxsize=None)
+def glyph_widths(font: str, bold: bool) -> tuple[dict[str, float], float]:
+    """Return (char -> width in em, fallback width in em) for a font family."""
+    scale = FAMILY_SCALE.get(font.lower(), FAMILY_SCALE[DEFAULT_FAMILY])
+    if bold:
+        scale *= BOLD_SCALE
+    widths = {ch: w * scale / 1000 for ch, w in HELVETICA_WIDTHS.items()}
+    return widths, DEFAULT_WIDTH * scale / 1000
+
+
+@functools.lru_cache(maxsize=65536)
+def text_width_em(text: str, font: str, bold: bool) -> float:
+    """Width of `text` in em (multiply by the font size in points for points)."""
+    widths, fallback = glyph_widths(font, bold)
+    return sum(widths.get(ch, fallback) for ch in text)
+
+
+def count_lines(paragraph: str, width_pt: float, font: str, size_pt: float, bold: bool) -> int:
+    """Number of lines `paragraph` wraps to at `width_pt` (greedy word wrap, >= 1)."""
+    words = paragraph.split()
+    if not words:
+        return 1
+    width_em = width_pt / size_pt
+    space_em = text_width_em(" ", font, bold)
+    lines = 1
+    used = 0.0
+    for word in words:
+        w = text_width_em(word, font, bold)
+        if used and used + space_em + w <= width_em:
+            used += space_em + w
+            continue
+        if used:
+            lines += 1
+        if w > width_em:
+            # A word wider than the box is broken across lines
+            extra = math.ceil(w / width_em) - 1
+            lines += extra
+            used = w - extra * width_em
+        else:
+            used = w
+    return lines
+
+
+def _paragraph_heights(paragraphs: list[str], box: TextBox, size_pt: float) -> list[float]:
+    pitch = size_pt * LINE_HEIGHT * box.line_spacing
+    return [count_lines(p, box.width_pt, box.font, size_pt, box.bold) * pitch for p in paragraphs]
+
+
+def _split_paragraph(paragraph: str, box: TextBox, size_pt: float, max_lines: int) -> tuple[str, str]:
+    """Split `paragraph` at a word boundary so the head wraps to at most `max_lines` lines."""
+    words = paragraph.split(" ")
+    lo, hi = 0, len(words)
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if count_lines(" ".join(words[:mid]), box.width_pt, box.font, size_pt, box.bold) <= max_lines:
+            lo = mid
+        else:
+            hi = mid - 1
+    return " ".join(words[:lo]), " ".join(words[lo:])
+
+
+def fit_text(paragraphs: list[str], box: TextBox, split: bool = True) -> tuple[float, list[str], list[str]]:
+    """
+    Decide how to lay out `paragraphs` in `box`. Returns (font size, fitted, rest):
+
+      - everything fits at the template size: (box.size_pt, paragraphs, [])
+      - it fits after shrinking within MIN_SCALE / MIN_FONT_PT: (smaller size, paragraphs, [])
+      - otherwise, at the smallest allowed size: with `split`, (size, the leading
+        paragraphs that fit, the rest), where the paragraph crossing the bottom edge is
+        split between lines; without it, (size, paragraphs, []) and the text overflows.
+        `fitted` is never empty, so placing `rest` in another box always makes progress.
+
+    The font never grows, even when the template's size is below MIN_FONT_PT:
+
+    >>> fit_text(["word " * 40], TextBox(100, 20, "calibri", 7.0), split=False)[0]
+    7.0
+    """
+    if sum(_paragraph_heights(paragraphs, box, box.size_pt)) <= box.height_pt:
+        return box.size_pt, paragraphs, []
+
+    # Largest size that fits; fitting is monotonic in size, so bisect the candidates
+    floor = min(box.size_pt, max(MIN_FONT_PT, box.size_pt * MIN_SCALE))
+    steps = int((box.size_pt - floor) / SIZE_STEP_PT)
+    sizes = [floor + i * SIZE_STEP_PT for i in range(steps + 1)]
+    overflows = lambda i: sum(_paragraph_heights(paragraphs, box, sizes[i])) > box.height_pt
+    first_overflow = bisect.bisect_left(range(len(sizes)), True, key=overflows)
+    if first_overflow > 0:
+        return sizes[first_overflow - 1], paragraphs, []
+    if not split:
+        return floor, paragraphs, []
+
+    pitch = floor * LINE_HEIGHT * box.line_spacing
+    used = 0.0
+    for count, height in enumerate(_paragraph_heights(paragraphs, box, floor)):
+        if used + height > box.height_pt:
+            break
+        used += height
+    free_lines = int((box.height_pt - used) / pitch)
+    if free_lines or not count:
+        head, tail = _split_paragraph(paragraphs[count], box, floor, max(1, free_lines))
+        if head:
+            return floor, paragraphs[:count] + [head], [tail] + paragraphs[count + 1:]
+        if not count:
+            # Not even one word fits; place it anyway rather than loop forever
+            return floor, paragraphs[:1], paragraphs[1:]
+    return floor, paragraphs[:count], paragraphs[count:]
@@ -0,0 +1,231 @@
+# watch.py
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from batch import DEFAULT_TEMPLATE, OUTPUT_DIR, RESUME_EXTS, format_one, output_path_for
+
+DEFAULT_INTERVAL = 10.0
+# Files modified more recently than this are probably still being copied in.
+SETTLE_SECONDS = 2.0
+MANIFEST_NAME = ".watch-manifest.json"
+
+
+def _sha256_file(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(1024 * 1024), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class WatchFolder:
+    """
+    Incrementally formats the résumés in `input_dir`.
+
+    The manifest maps each file name to {size, mtime_ns, sha256, output, error}.
+    A cycle stats every file but only hashes files whose size or mtime changed, and
+    only parses/merges files whose content hash changed. Each source keeps its own
+    output (`cv.docx` and `cv.pdf` get different decks, see batch.output_path_for);
+    outputs of files that disappeared are deleted. Failed files are remembered and
+    retried only once their content changes; a failed rebuild deletes the old deck.
+    Files removed mid-cycle are skipped. If a worker process dies, the pool is
+    replaced and the files it was running are retried one at a time, so only a file
+    that crashes its worker on its own is recorded as failed.
+    """
+
+    def __init__(self, input_dir: str, template_path: str, output_dir: str = OUTPUT_DIR,
+                 manifest_path: str | None = None, workers: int | None = None,
+                 cache_dir: str | None = None):
+        self.input_dir = input_dir
+        self.template_path = template_path
+        self.output_dir = output_dir
+        self.manifest_path = manifest_path or os.path.join(output_dir, MANIFEST_NAME)
+        self.cache_dir = cache_dir
+        self.workers = workers
+        self.pool = ProcessPoolExecutor(max_workers=workers)
+        self.manifest = self._load_manifest()
+
+    def _load_manifest(self) -> dict:
+        try:
+            with open(self.manifest_path, encoding="utf-8") as fh:
+                return json.load(fh)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _save_manifest(self):
+        tmp_path = self.manifest_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as fh:
+            json.dump(self.manifest, fh, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.manifest_path)
+
+    def _submit(self, task: tuple):
+        """Submit format_one(*task), replacing the pool first if it has lost a worker."""
+        try:
+            return self.pool.submit(format_one, *task)
+        except BrokenProcessPool:
+            self._replace_pool()
+            return self.pool.submit(format_one, *task)
+
+    def _replace_pool(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
+        self.pool = ProcessPoolExecutor(max_workers=self.workers)
+
+    def _scan(self) -> tuple[dict[str, os.stat_result], set[str]]:
+        """Return (settled files -> stat, names of all résumé files present)."""
+        now = time.time()
+        settled = {}
+        present = set()
+        with os.scandir(self.input_dir) as it:
+            for entry in it:
+                if entry.is_file() and entry.name.lower().endswith(RESUME_EXTS):
+                    try:
+                        st = entry.stat()
+                    except FileNotFoundError:
+                        continue  # removed while scanning
+                    present.add(entry.name)
+                    if now - st.st_mtime >= SETTLE_SECONDS:
+                        settled[entry.name] = st
+        return settled, present
+
+    def run_once(self, on_result=None) -> dict:
+        """Run one cycle. Returns counts: scanned, hashed, formatted, failed, removed."""
+        os.makedirs(self.output_dir, exist_ok=True)
+        stats = {"scanned": 0, "hashed": 0, "formatted": 0, "failed": 0, "removed": 0}
+        current, present = self._scan()
+        stats["scanned"] = len(present)
+        dirty = False
+
+        # Sources that disappeared: drop their outputs (unless another source owns it)
+        for name in [n for n in self.manifest if n not in present]:
+            output = self.manifest.pop(name).get("output")
+            in_use = any(e.get("output") == output for e in self.manifest.values())
+            if output and not in_use and os.path.exists(output):
+                os.remove(output)
+            stats["removed"] += 1
+            dirty = True
+
+        taken = {e["output"].lower() for e in self.manifest.values() if e.get("output")}
+
+        # New or changed sources
+        pending = {}
+        for name, st in sorted(current.items()):
+            entry = self.manifest.get(name)
+            if entry and entry["size"] == st.st_size and entry["mtime_ns"] == st.st_mtime_ns:
+                continue
+            path = os.path.join(self.input_dir, name)
+            try:
+                digest = _sha256_file(path)
+            except FileNotFoundError:
+                continue  # removed since the scan; dropped next cycle
+            stats["hashed"] += 1
+            if entry and entry["sha256"] == digest:
+                entry.update(size=st.st_size, mtime_ns=st.st_mtime_ns)  # touched, not changed
+                dirty = True
+                continue
+            output = (entry or {}).get("output") or output_path_for(path, self.output_dir, taken)
+            taken.add(output.lower())
+            self.manifest[name] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": digest,
+                                   "output": output, "error": ""}
+            task = (path, self.template_path, self.output_dir, self.cache_dir, None, output)
+            pending[name] = (task, self._submit(task))
+
+        crashed = []
+        for name, (task, future) in pending.items():
+            try:
+                result = future.result()
+            except BrokenProcessPool:
+                crashed.append((name, task))
+                continue
+            self._record(name, result, stats, on_result)
+            dirty = True
+
+        if crashed:
+            self._replace_pool()
+            for name, task in crashed:
+                # Rerun alone so only a file that kills its worker by itself is marked failed
+                with ProcessPoolExecutor(max_workers=1) as pool:
+                    try:
+                        result = pool.submit(format_one, *task).result()
+                    except BrokenProcessPool as e:
+                        result = {"source": task[0], "output": "", "error": f"{type(e).__name__}: {e}",
+                                  "seconds": 0.0, "cache": {}}
+                self._record(name, result, stats, on_result)
+                dirty = True
+
+        if dirty:
+            self._save_manifest()
+        return stats
+
+    def _record(self, name: str, result: dict, stats: dict, on_result=None):
+        """Store a format_one result in the manifest; a failed rebuild deletes the old deck."""
+        entry = self.manifest[name]
+        if result["error"]:
+            in_use = any(e is not entry and e.get("output") == entry["output"]
+                         for e in self.manifest.values())
+            if not in_use and os.path.exists(entry["output"]):
+                os.remove(entry["output"])
+        entry.update(output=result["output"], error=result["error"])
+        stats["failed" if result["error"] else "formatted"] += 1
+        if on_result:
+            on_result(result)
+
+    def run_forever(self, interval: float = DEFAULT_INTERVAL, on_result=None, on_cycle=None):
+        while True:
+            started = time.monotonic()
+            stats = self.run_once(on_result)
+            if on_cycle:
+                on_cycle(stats)
+            time.sleep(max(0.0, interval - (time.monotonic() - started)))
+
+    def close(self):
+        self.pool.shutdown()
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description="Watch a folder and format new or changed résumés.")
+    ap.add_argument("input_dir", help="folder recruiters drop résumés into")
+    ap.add_argument("-t", "--template", default=DEFAULT_TEMPLATE, help="PPTX template path")
+    ap.add_argument("-o", "--output-dir", default=OUTPUT_DIR, help="directory for formatted decks")
+    ap.add_argument("--manifest", default=None,
+                    help=f"change manifest path (default: <output-dir>/{MANIFEST_NAME})")
+    ap.add_argument("-j", "--workers", type=int, default=None,
+                    help="number of worker processes (default: CPU count)")
+    ap.add_argument("--cache-dir", default=None,
+                    help="reuse parsed résumés and rendered decks from this cache directory")
+    ap.add_argument("--interval", type=float, default=DEFAULT_INTERVAL, help="seconds between scans")
+    ap.add_argument("--once", action="store_true", help="run a single cycle and exit")
+    args = ap.parse_args(argv)
+
+    def report(result):
+        if result["error"]:
+            print(f"FAIL {result['source']}: {result['error']}", file=sys.stderr)
+        else:
+            print(f"ok   {result['source']} -> {result['output']}")
+
+    def report_cycle(stats):
+        if stats["formatted"] or stats["failed"] or stats["removed"]:
+            print("cycle: " + ", ".join(f"{k}={v}" for k, v in stats.items()))
+
+    watcher = WatchFolder(args.input_dir, args.template, args.output_dir, args.manifest,
+                          args.workers, args.cache_dir)
+    try:
+        if args.once:
+            report_cycle(watcher.run_once(report))
+        else:
+            watcher.run_forever(args.interval, report, report_cycle)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())